@@ -0,0 +1,16 @@
+-- Indexes for server-side schedule scoring (WebScheduleMatcher scoring_mode = 'sql').
+-- get_common_slot_counts_sql joins one user's available slots to every other
+-- student's available rows on (day_of_week, time_slot_start); the partial
+-- covering index lets that join run as an index-only scan over available rows.
+
+CREATE INDEX IF NOT EXISTS idx_user_availability_available_slot
+    ON sample_user_availability (day_of_week, time_slot_start)
+    INCLUDE (usn)
+    WHERE is_available;
+
+-- Compact storage (availability_mask_migration.sql): join on day, read the mask from the index
+CREATE INDEX IF NOT EXISTS idx_user_availability_mask_day
+    ON sample_user_availability_mask (day_of_week)
+    INCLUDE (usn, slot_mask);
+
+ANALYZE sample_user_availability;
@@ -0,0 +1,25 @@
+-- Compact availability storage: one 12-bit slot mask per (usn, day) instead of
+-- 12 sample_user_availability rows. Bit i is TIME_SLOTS[i] (bit 0 = 00:00-02:00,
+-- bit 11 = 22:00-00:00); a clear bit means the student marked the slot unavailable.
+--
+-- Enable with st.secrets["availability_storage"] = "compact" in data_collection.py
+-- and db_config['availability_storage'] = 'compact' for WebScheduleMatcher.
+-- Also (re)run submit_user_profile.sql so submissions can write the mask table.
+
+CREATE TABLE IF NOT EXISTS sample_user_availability_mask (
+    usn VARCHAR(10) NOT NULL REFERENCES sample_users (usn) ON DELETE CASCADE,
+    day_of_week SMALLINT NOT NULL CHECK (day_of_week BETWEEN 0 AND 6),
+    slot_mask SMALLINT NOT NULL DEFAULT 0 CHECK (slot_mask BETWEEN 0 AND 4095),
+    PRIMARY KEY (usn, day_of_week)
+);
+
+-- Backfill from the per-slot rows (slot index = start hour / 2)
+INSERT INTO sample_user_availability_mask (usn, day_of_week, slot_mask)
+SELECT
+    usn,
+    day_of_week,
+    COALESCE(BIT_OR(1 << (EXTRACT(HOUR FROM time_slot_start)::INTEGER / 2)) FILTER (WHERE is_available), 0)::SMALLINT
+FROM sample_user_availability
+GROUP BY usn, day_of_week
+ON CONFLICT (usn, day_of_week) DO UPDATE SET
+    slot_mask = EXCLUDED.slot_mask;
@@ -0,0 +1,58 @@
+-- Push profile changes to WebScheduleMatcher caches via LISTEN/NOTIFY.
+-- Every insert/update/delete on a profile table sends the affected usn on the
+-- 'profile_changes' channel; WebScheduleMatcher.start_change_listener() evicts
+-- (or refreshes) exactly those cached profiles.
+--
+-- Notifications are delivered at commit, and Postgres folds identical
+-- (channel, payload) pairs within a transaction, so one form submission
+-- (one user row, a few skills, 84 availability rows) arrives as one message.
+--
+-- Local check (two psql sessions):
+--   LISTEN profile_changes;
+--   UPDATE sample_users SET year = year WHERE usn = '1KG22AD001';
+--   -- the first session prints: Asynchronous notification "profile_changes"
+--   -- with payload "1KG22AD001"
+
+CREATE OR REPLACE FUNCTION notify_profile_change() RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('profile_changes', OLD.usn);
+        RETURN OLD;
+    END IF;
+
+    PERFORM pg_notify('profile_changes', NEW.usn);
+    IF TG_OP = 'UPDATE' AND NEW.usn IS DISTINCT FROM OLD.usn THEN
+        PERFORM pg_notify('profile_changes', OLD.usn);
+    END IF;
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS sample_users_notify_change ON sample_users;
+CREATE TRIGGER sample_users_notify_change
+    AFTER INSERT OR UPDATE OR DELETE ON sample_users
+    FOR EACH ROW EXECUTE FUNCTION notify_profile_change();
+
+DROP TRIGGER IF EXISTS sample_user_skills_notify_change ON sample_user_skills;
+CREATE TRIGGER sample_user_skills_notify_change
+    AFTER INSERT OR UPDATE OR DELETE ON sample_user_skills
+    FOR EACH ROW EXECUTE FUNCTION notify_profile_change();
+
+DROP TRIGGER IF EXISTS sample_user_availability_notify_change ON sample_user_availability;
+CREATE TRIGGER sample_user_availability_notify_change
+    AFTER INSERT OR UPDATE OR DELETE ON sample_user_availability
+    FOR EACH ROW EXECUTE FUNCTION notify_profile_change();
+
+-- Compact storage (availability_mask_migration.sql)
+DO $$
+BEGIN
+    IF to_regclass('sample_user_availability_mask') IS NOT NULL THEN
+        DROP TRIGGER IF EXISTS sample_user_availability_mask_notify_change ON sample_user_availability_mask;
+        CREATE TRIGGER sample_user_availability_mask_notify_change
+            AFTER INSERT OR UPDATE OR DELETE ON sample_user_availability_mask
+            FOR EACH ROW EXECUTE FUNCTION notify_profile_change();
+    END IF;
+END;
+$$;
@@ -0,0 +1,40 @@
+-- Server-side skill search for the form's skill picker (WebScheduleMatcher.search_skills).
+-- Called via conn.client.rpc('search_skills', {'p_query': 'pyt', 'p_limit': 10}).
+--
+-- Ranking: whole-name prefix, then word prefix, then substring, then trigram
+-- similarity (catches typos like 'pyhton'); ties go to shorter names.
+-- The trigram GIN index serves both the substring and the similarity filter,
+-- so lookups stay index-driven as custom skills accumulate.
+--
+-- Local check:
+--   SELECT * FROM search_skills('learn');
+--   SELECT * FROM search_skills('pyhton', 5);
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS skills_name_trgm_idx
+    ON skills USING GIN (lower(name) gin_trgm_ops);
+
+CREATE OR REPLACE FUNCTION search_skills(p_query TEXT, p_limit INTEGER DEFAULT 10)
+RETURNS TABLE (skill_id INTEGER, name TEXT)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH q AS (
+        SELECT lower(btrim(p_query)) AS term,
+               -- LIKE pattern with the user's wildcards escaped
+               replace(replace(replace(lower(btrim(p_query)), '\', '\\'), '%', '\%'), '_', '\_') AS pattern
+    )
+    SELECT s.skill_id, s.name::TEXT
+    FROM skills s, q
+    WHERE q.term <> ''
+      AND (lower(s.name) LIKE '%' || q.pattern || '%' OR lower(s.name) % q.term)
+    ORDER BY
+        lower(s.name) LIKE q.pattern || '%' DESC,
+        lower(s.name) LIKE '% ' || q.pattern || '%' DESC,
+        lower(s.name) LIKE '%' || q.pattern || '%' DESC,
+        similarity(lower(s.name), q.term) DESC,
+        length(s.name),
+        s.name
+    LIMIT p_limit;
+$$;
@@ -0,0 +1,104 @@
+-- Whole form submission in one transaction and one round trip.
+-- Called from save_user_data via conn.client.rpc('submit_user_profile', {...}).
+--
+-- p_skills:       [{"name": "Python", "proficiency_level": 4}, ...]
+-- p_availability: [{"day_of_week": 1, "time_slot_start": "08:00:00",
+--                   "time_slot_end": "10:00:00", "is_available": true}, ...]
+-- p_day_masks:    [{"day_of_week": 1, "slot_mask": 48}, ...] for compact storage
+--                 (see availability_mask_migration.sql); NULL for per-slot rows
+--
+-- Availability is diffed against the stored grid: unchanged slots are left
+-- alone, changed or new ones are written, and stored slots missing from a
+-- non-empty p_availability are deleted. Returns
+-- {"availability_written": n, "availability_deleted": m}.
+--
+-- Local check:
+--   SELECT submit_user_profile('1KG22AD001', 'Test', 'User', 'CS', 3,
+--       '[{"name": "Python", "proficiency_level": 4}]',
+--       '[{"day_of_week": 1, "time_slot_start": "08:00", "time_slot_end": "10:00", "is_available": true}]');
+
+DROP FUNCTION IF EXISTS submit_user_profile(TEXT, TEXT, TEXT, TEXT, INTEGER, JSONB, JSONB);
+DROP FUNCTION IF EXISTS submit_user_profile(TEXT, TEXT, TEXT, TEXT, INTEGER, JSONB, JSONB, JSONB);
+
+CREATE OR REPLACE FUNCTION submit_user_profile(
+    p_usn TEXT,
+    p_first_name TEXT,
+    p_last_name TEXT,
+    p_department TEXT,
+    p_year INTEGER,
+    p_skills JSONB,
+    p_availability JSONB,
+    p_day_masks JSONB DEFAULT NULL
+) RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_written INTEGER := 0;
+    v_deleted INTEGER := 0;
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM jsonb_to_recordset(p_skills) AS s(name TEXT, proficiency_level INTEGER)
+        WHERE s.proficiency_level NOT BETWEEN 0 AND 5
+    ) THEN
+        RAISE EXCEPTION 'Invalid proficiency level';
+    END IF;
+
+    INSERT INTO sample_users (usn, first_name, last_name, department, year)
+    VALUES (p_usn, p_first_name, p_last_name, p_department, p_year)
+    ON CONFLICT (usn) DO UPDATE SET
+        first_name = EXCLUDED.first_name,
+        last_name = EXCLUDED.last_name,
+        department = EXCLUDED.department,
+        year = EXCLUDED.year;
+
+    -- Create any custom skills, then link all of them to the user
+    INSERT INTO skills (name)
+    SELECT DISTINCT s.name
+    FROM jsonb_to_recordset(p_skills) AS s(name TEXT, proficiency_level INTEGER)
+    ON CONFLICT (name) DO NOTHING;
+
+    INSERT INTO sample_user_skills (usn, skill_id, proficiency_level)
+    SELECT DISTINCT ON (sk.skill_id) p_usn, sk.skill_id, s.proficiency_level
+    FROM jsonb_to_recordset(p_skills) AS s(name TEXT, proficiency_level INTEGER)
+    JOIN skills sk ON sk.name = s.name
+    ON CONFLICT (usn, skill_id) DO UPDATE SET
+        proficiency_level = EXCLUDED.proficiency_level;
+
+    IF jsonb_array_length(p_availability) > 0 THEN
+        -- Slots the submitted grid no longer has (e.g. an older slot layout)
+        DELETE FROM sample_user_availability sa
+        WHERE sa.usn = p_usn
+          AND NOT EXISTS (
+              SELECT 1
+              FROM jsonb_to_recordset(p_availability)
+                  AS a(day_of_week INTEGER, time_slot_start TIME, time_slot_end TIME)
+              WHERE a.day_of_week = sa.day_of_week
+                AND a.time_slot_start = sa.time_slot_start
+                AND a.time_slot_end = sa.time_slot_end
+          );
+        GET DIAGNOSTICS v_deleted = ROW_COUNT;
+
+        -- Unchanged slots fail the WHERE and are not rewritten
+        INSERT INTO sample_user_availability (usn, day_of_week, time_slot_start, time_slot_end, is_available)
+        SELECT p_usn, a.day_of_week, a.time_slot_start, a.time_slot_end, a.is_available
+        FROM jsonb_to_recordset(p_availability)
+            AS a(day_of_week INTEGER, time_slot_start TIME, time_slot_end TIME, is_available BOOLEAN)
+        ON CONFLICT (usn, day_of_week, time_slot_start, time_slot_end) DO UPDATE SET
+            is_available = EXCLUDED.is_available
+        WHERE sample_user_availability.is_available IS DISTINCT FROM EXCLUDED.is_available;
+        GET DIAGNOSTICS v_written = ROW_COUNT;
+    END IF;
+
+    IF p_day_masks IS NOT NULL THEN
+        INSERT INTO sample_user_availability_mask (usn, day_of_week, slot_mask)
+        SELECT p_usn, m.day_of_week, m.slot_mask
+        FROM jsonb_to_recordset(p_day_masks) AS m(day_of_week INTEGER, slot_mask INTEGER)
+        ON CONFLICT (usn, day_of_week) DO UPDATE SET
+            slot_mask = EXCLUDED.slot_mask
+        WHERE sample_user_availability_mask.slot_mask IS DISTINCT FROM EXCLUDED.slot_mask;
+        GET DIAGNOSTICS v_written = ROW_COUNT;
+    END IF;
+
+    RETURN jsonb_build_object('availability_written', v_written, 'availability_deleted', v_deleted);
+END;
+$$;
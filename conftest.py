@@ -0,0 +1 @@
+# Lets pytest import the top-level modules (scheduling, data_collection) from tests/
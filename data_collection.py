@@ -1,7 +1,11 @@
 import streamlit as st
+import pandas as pd
 from db_connection import get_db_connection, get_departments, initialize_database
+from scheduling import WebScheduleMatcher
 from datetime import time
+import time as time_module
 from typing import List, Dict, Any
+from postgrest.exceptions import APIError
 
 # Page config
 st.set_page_config(
@@ -27,6 +31,20 @@ def init_connection():
 
 conn = init_connection()
 
+@st.cache_resource(ttl=3600)
+def init_skill_search():
+    """
+    Matcher holding the in-process skill name index, shared across sessions
+
+    Submissions here add their new skills; skills added by other processes
+    show up through the search_skills fallback until the hourly rebuild.
+    """
+    matcher = WebScheduleMatcher({'type': 'supabase', 'client': conn.client})
+    if not matcher.connect_to_database():
+        return None
+    matcher.build_skill_index()
+    return matcher
+
 # Constants
 TIME_SLOTS = [
     (time(0, 0), time(2, 0)),   # 12 AM - 2 AM
@@ -45,6 +63,10 @@ TIME_SLOTS = [
 DAYS_OF_WEEK = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
 DAY_TO_INT = {day: i for i, day in enumerate(DAYS_OF_WEEK)}
 
+# 'rows': one sample_user_availability row per slot (84 per submission)
+# 'compact': one 12-bit mask per day in sample_user_availability_mask (SQL_scripts/availability_mask_migration.sql)
+AVAILABILITY_STORAGE = st.secrets.get("availability_storage", "rows")
+
 def validate_usn_format(usn: str) -> bool:
     """
     Validate USN format: 1KG[year][dept_code][roll_number]
@@ -110,14 +132,34 @@ def validate_input(value: str, field_name: str, max_length: int = 100) -> str:
     return sanitized
 
 # INITIALIZE FORM DATA
-@st.cache_data(ttl=3600)
-def get_skills() -> List[str]:
-    """retrieve all skills from database to generate suggestions"""
+@st.cache_data(ttl=300)
+def get_fuzzy_skill_matches(query: str, limit: int) -> List[str]:
+    """Prefix and pg_trgm matches from the skills table itself (SQL_scripts/skill_search.sql)"""
+    try:
+        return init_skill_search().search_skills(query, limit)
+    except APIError as api_error:
+        # PGRST202: search function not deployed yet, prefix matches only
+        if api_error.code != 'PGRST202':
+            print(f"Skill search failed: {api_error}")
+        return []
+
+def search_skill_names(query: str, limit: int = 10) -> List[str]:
+    """Top skill names for what the user typed: in-process prefix index, topped up from the database"""
+    if not query.strip():
+        return []
     try:
-        result = conn.table('skills').select('name').order('name').execute() # list skills in alphabetical order
-        return [row['name'] for row in result.data]
+        skill_search = init_skill_search()
+        if skill_search is None:
+            return []
+        
+        # A short list may just mean the index has not seen skills added elsewhere yet
+        matches = skill_search.skill_index.search(query, limit)
+        if len(matches) < limit:
+            fuzzy = get_fuzzy_skill_matches(' '.join(query.lower().split()), limit)
+            matches += [name for name in fuzzy if name not in matches][:limit - len(matches)]
+        return matches
     except Exception as e:
-        st.error("Error fetching skills from database")
+        st.error("Error searching skills")
         return []
     
 def create_availability_grid() -> Dict[str, List[bool]]:
@@ -141,7 +183,6 @@ def render_skills_section():
 
     st.header("Skills")
     
-    all_skills = get_skills()
     skills = st.session_state.form_data['skills']
     
     # Add new skill section
@@ -149,9 +190,15 @@ def render_skills_section():
     col1, col2 = st.columns([3, 1])
     
     with col1:
-        skill_options = [""] + ["+ Add Custom Skill"] + all_skills  # blank option, list of skils, and custom skill option
+        # Only the top matches for the typed text are sent to the browser, not the whole skills table
+        skill_query = st.text_input(
+            "Search skills",
+            key="skill_query",
+            placeholder="Start typing a skill, e.g. pyt, learn, cad"
+        )
+        skill_options = [""] + ["+ Add Custom Skill"] + search_skill_names(skill_query)  # blank option, custom skill option, and top matches
         selected_skill = st.selectbox(
-            "Select or type a skill. If your desired skill is not in the list, select the '+ Add Custom Skill' option.",
+            "Select a matching skill. If your desired skill is not in the list, select the '+ Add Custom Skill' option.",
             options=skill_options,
             key="skill_selector"
         )
@@ -230,83 +277,131 @@ def render_skills_section():
             st.session_state.current_step = 'availability'
             st.rerun()
 
+def availability_frame(availability: Dict[str, List[bool]]) -> pd.DataFrame:
+    """Availability grid as a frame: one row per time slot, one boolean column per day"""
+    slot_labels = [f"{start.strftime('%I:%M %p')} - {end.strftime('%I:%M %p')}" for start, end in TIME_SLOTS]
+    return pd.DataFrame(
+        {day: [bool(value) for value in availability[day][:len(TIME_SLOTS)]] for day in DAYS_OF_WEEK},
+        index=slot_labels
+    )
+
 def render_availability_grid():
-    """Render availability grid with mobile-responsive layout"""
+    """Render the availability grid as a single data editor (one widget instead of 84 checkboxes)"""
     st.subheader("Available Times")
     st.markdown("Please select all time slots when you are typically available for study or project meetings.")
     st.info("NOTE: If you are resubmitting the form, please fill in ALL of your available slots again.")
     
-    # Mobile-responsive styles
-    st.markdown(
-        """
-        <style>
-        .availability-mobile-grid {
-            display: flex;
-            flex-direction: column;
-            gap: 10px;
-        }
-        .availability-mobile-day {
-            border: 1px solid #e0e0e0;
-            border-radius: 5px;
-            padding: 10px;
-            background-color: #f9f9f9;
-        }
-        .availability-mobile-day-header {
-            font-weight: bold;
-            margin-bottom: 10px;
-            text-align: center;
-        }
-        .availability-mobile-slot {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 5px;
-        }
-        .availability-mobile-slot-time {
-            flex-grow: 1;
-            margin-right: 10px;
-        }
-        </style>
-        """,
-        unsafe_allow_html=True,
+    # The editor's widget ID depends on its input data, so the input must not change while it is on
+    # screen: build it from form_data only when the editor is (re)shown, never from its own output.
+    # Streamlit drops the editor's state on any run it is not rendered (other steps, after submit).
+    if 'availability_editor' not in st.session_state or 'availability_base' not in st.session_state:
+        st.session_state.availability_base = availability_frame(st.session_state.form_data['availability'])
+    
+    edited = st.data_editor(
+        st.session_state.availability_base,
+        column_config={
+            day: st.column_config.CheckboxColumn(day[:3], help=day, default=False)
+            for day in DAYS_OF_WEEK
+        },
+        num_rows="fixed",
+        use_container_width=True,
+        key="availability_editor"
     )
     
-    # Create mobile-responsive grid
-    st.markdown('<div class="availability-mobile-grid">', unsafe_allow_html=True)
+    # Same session-state contract as before: day name -> list of booleans per time slot
+    st.session_state.form_data['availability'] = {
+        day: [bool(value) for value in edited[day]] for day in DAYS_OF_WEEK
+    }
+
+def build_day_masks(availability: Dict[str, List[bool]]) -> List[Dict[str, int]]:
+    """Pack the availability grid into one 12-bit slot mask per day (bit i = TIME_SLOTS[i])"""
+    day_masks = []
+    for day, slots in availability.items():
+        if day not in DAYS_OF_WEEK:
+            continue  # Skip invalid days
+        
+        slot_mask = 0
+        for i, is_available in enumerate(slots[:len(TIME_SLOTS)]):
+            if is_available:
+                slot_mask |= 1 << i
+        day_masks.append({'day_of_week': DAY_TO_INT[day], 'slot_mask': slot_mask})
+    return day_masks
+
+def save_user_data_via_tables(user_data: Dict[str, Any], skill_levels: Dict[str, int],
+                              availability_records: List[Dict[str, Any]],
+                              day_masks: List[Dict[str, int]] = None) -> Dict[str, int]:
+    """Write a validated submission with separate table calls (no transaction); returns availability row counts"""
+    usn = user_data['usn']
+    
+    # Upsert user data
+    conn.table('sample_users').upsert(user_data, on_conflict='usn').execute()
     
-    # Iterate through each day
-    for day in DAYS_OF_WEEK:
-        st.markdown(f'<div class="availability-mobile-day">', unsafe_allow_html=True)
-        st.markdown(f'<div class="availability-mobile-day-header">{day}</div>', unsafe_allow_html=True)
+    # Handle skills: one lookup, one insert for new names, one upsert for the user's skills
+    if skill_levels:
+        skill_names = list(skill_levels)
+        skill_result = conn.table('skills').select('skill_id, name').in_('name', skill_names).execute()
+        skill_ids = {row['name']: row['skill_id'] for row in skill_result.data}
+    
+        missing_skills = [name for name in skill_names if name not in skill_ids]
+        if missing_skills:
+            new_skills = conn.table('skills').insert([{'name': name} for name in missing_skills]).execute()
+            skill_ids.update({row['name']: row['skill_id'] for row in new_skills.data})
+    
+        user_skill_records = [
+            {
+                'usn': usn,
+                'skill_id': skill_ids[name],
+                'proficiency_level': proficiency
+            }
+            for name, proficiency in skill_levels.items()
+        ]
+        conn.table('sample_user_skills').upsert(user_skill_records, on_conflict='usn,skill_id').execute()
+    
+    # Availability: read the stored grid once and write only the slots that changed
+    availability_written = availability_deleted = 0
+    if availability_records:
+        stored = conn.table('sample_user_availability').select(
+            'day_of_week, time_slot_start, time_slot_end, is_available'
+        ).eq('usn', usn).execute()
+        stored_slots = {
+            (row['day_of_week'], row['time_slot_start'], row['time_slot_end']): row['is_available']
+            for row in stored.data
+        }
+        submitted_slots = {
+            (record['day_of_week'], record['time_slot_start'], record['time_slot_end'])
+            for record in availability_records
+        }
         
-        # Iterate through time slots for this day
-        for time_idx, (start, end) in enumerate(TIME_SLOTS):
-            time_label = f"{start.strftime('%I:%M %p')} - {end.strftime('%I:%M %p')}"
-            key = f"availability_{day}_{time_idx}"
-            current_value = st.session_state.form_data['availability'][day][time_idx]
-            
-            # Create a row for each time slot
-            st.markdown(f'<div class="availability-mobile-slot">', unsafe_allow_html=True)
-            
-            # Time label column
-            st.markdown(f'<div class="availability-mobile-slot-time">{time_label}</div>', unsafe_allow_html=True)
-            
-            # Checkbox column
-            new_value = st.checkbox(
-                "",
-                key=key,
-                value=current_value,
-                label_visibility="collapsed",
-            )
-            
-            # Update session state
-            st.session_state.form_data['availability'][day][time_idx] = new_value
-            
-            st.markdown('</div>', unsafe_allow_html=True)
+        # Rows for slots the grid no longer has (e.g. an older slot layout)
+        removed_slots = [slot for slot in stored_slots if slot not in submitted_slots]
+        if removed_slots:
+            conn.table('sample_user_availability').delete().eq('usn', usn).or_(','.join(
+                f'and(day_of_week.eq.{day},time_slot_start.eq."{start}",time_slot_end.eq."{end}")'
+                for day, start, end in removed_slots
+            )).execute()
+            availability_deleted = len(removed_slots)
         
-        st.markdown('</div>', unsafe_allow_html=True)
+        changed_records = [
+            record for record in availability_records
+            if stored_slots.get((record['day_of_week'], record['time_slot_start'],
+                                 record['time_slot_end'])) != record['is_available']
+        ]
+        if changed_records:
+            conn.table('sample_user_availability').upsert(changed_records, on_conflict = 'usn,day_of_week,time_slot_start,time_slot_end').execute()
+            availability_written = len(changed_records)
+    
+    if day_masks:
+        stored = conn.table('sample_user_availability_mask').select('day_of_week, slot_mask').eq('usn', usn).execute()
+        stored_masks = {row['day_of_week']: row['slot_mask'] for row in stored.data}
+        mask_records = [
+            dict(day_mask, usn=usn) for day_mask in day_masks
+            if stored_masks.get(day_mask['day_of_week']) != day_mask['slot_mask']
+        ]
+        if mask_records:
+            conn.table('sample_user_availability_mask').upsert(mask_records, on_conflict='usn,day_of_week').execute()
+            availability_written = len(mask_records)
     
-    st.markdown('</div>', unsafe_allow_html=True)
+    return {'availability_written': availability_written, 'availability_deleted': availability_deleted}
 
 def save_user_data(form_data: Dict[str, Any]) -> bool:
     """Save user data in the database"""
@@ -325,10 +420,8 @@ def save_user_data(form_data: Dict[str, Any]) -> bool:
             'year': int(form_data['year'])  
         }
         
-        # Upsert user data
-        conn.table('sample_users').upsert(user_data, on_conflict='usn').execute()
-        
-        # Handle skills
+        # Validate skills up front (name -> proficiency, duplicates collapsed)
+        skill_levels = {}
         for skill_data in form_data['skills']:
             skill_name = validate_input(skill_data['name'], 'skill_name', 100).strip()
             if not skill_name:
@@ -337,24 +430,9 @@ def save_user_data(form_data: Dict[str, Any]) -> bool:
             proficiency = int(skill_data['proficiency_level'])
             if not 0 <= proficiency <= 5:
                 raise ValueError("Invalid proficiency level")
-                ok
-            # Get or create skill
-            skill_result = conn.table('skills').select('skill_id').eq('name', skill_name).execute()
-            if not skill_result.data:
-                new_skill = conn.table('skills').insert({'name': skill_name}).execute()
-                skill_id = new_skill.data[0]['skill_id']
-            else:
-                skill_id = skill_result.data[0]['skill_id']
-            
-            # Upsert user-skill relationship
-            user_skill_data = {
-                'usn': usn.upper(),
-                'skill_id': skill_id,
-                'proficiency_level': proficiency
-            }
-            conn.table('sample_user_skills').upsert(user_skill_data, on_conflict='usn,skill_id').execute()
+            skill_levels[skill_name] = proficiency
         
-        # Insert new availability
+        # Build availability records
         availability_records = []
         for day, slots in form_data['availability'].items():
             if day not in DAYS_OF_WEEK:
@@ -386,8 +464,51 @@ def save_user_data(form_data: Dict[str, Any]) -> bool:
                         'is_available': False
                     })
         
-        if availability_records:
-            conn.table('sample_user_availability').upsert(availability_records, on_conflict = 'usn,day_of_week,time_slot_start,time_slot_end').execute()
+        # Compact storage writes 7 day masks instead of 84 slot rows
+        day_masks = None
+        if AVAILABILITY_STORAGE == 'compact':
+            day_masks = build_day_masks(form_data['availability'])
+            availability_records = []
+        
+        started = time_module.perf_counter()
+        try:
+            # Whole submission in one transaction and one round trip (SQL_scripts/submit_user_profile.sql);
+            # the function diffs availability against the stored grid and reports what it wrote
+            result = conn.client.rpc('submit_user_profile', {
+                'p_usn': user_data['usn'],
+                'p_first_name': user_data['first_name'],
+                'p_last_name': user_data['last_name'],
+                'p_department': user_data['department'],
+                'p_year': user_data['year'],
+                'p_skills': [
+                    {'name': name, 'proficiency_level': proficiency}
+                    for name, proficiency in skill_levels.items()
+                ],
+                'p_availability': availability_records,
+                'p_day_masks': day_masks
+            }).execute()
+            write_stats = result.data if isinstance(result.data, dict) else {}
+        except APIError as api_error:
+            # PGRST202: function not deployed yet, fall back to separate table writes
+            if api_error.code != 'PGRST202':
+                raise
+            write_stats = save_user_data_via_tables(user_data, skill_levels, availability_records, day_masks)
+        
+        elapsed_ms = (time_module.perf_counter() - started) * 1000
+        print(
+            f"Saved {user_data['usn']} in {elapsed_ms:.1f} ms: "
+            f"{write_stats.get('availability_written', 'n/a')} availability rows written, "
+            f"{write_stats.get('availability_deleted', 'n/a')} deleted"
+        )
+        
+        # Custom skills become searchable right away
+        try:
+            skill_search = init_skill_search()
+            if skill_search is not None:
+                for skill_name in skill_levels:
+                    skill_search.skill_index.add(skill_name)
+        except Exception as e:
+            print(f"Skill index update failed: {e}")
         
         return True
             
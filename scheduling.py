@@ -1,9 +1,24 @@
 import pandas as pd
-from typing import List, Dict, Set, Optional, Tuple
-from collections import defaultdict
+import numpy as np
+from typing import TYPE_CHECKING, List, Dict, Set, Optional, Tuple
+from collections import OrderedDict, defaultdict
+from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor,
+                                as_completed, wait)
+from contextlib import asynccontextmanager, contextmanager
+import asyncio
+import bisect
+import contextvars
+import heapq
 import itertools
 from datetime import datetime, time
 import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time as time_module
 
 # Database imports (choose one based on your preference)
 # Option 1: PostgreSQL with psycopg2
@@ -17,6 +32,15 @@ from supabase import create_client, Client
 # from sqlalchemy import create_engine, text
 # import os
 
+if TYPE_CHECKING:
+    from scipy.sparse import csr_matrix
+
+# Tables carrying the trigger from SQL_scripts/profile_change_notify.sql
+_NOTIFY_TRIGGER_TABLES_SQL = """
+    SELECT tgrelid::regclass::text FROM pg_trigger
+    WHERE NOT tgisinternal AND tgfoid = to_regproc('notify_profile_change')
+"""
+
 class WebScheduleMatcher:
     """
     Web-Ready Schedule Matcher for Team Formation
@@ -25,6 +49,7 @@ class WebScheduleMatcher:
     - Database integration (PostgreSQL/Supabase) using existing schema
     - Profile recommendation with schedule match percentage
     - Team meeting time suggestions
+    - Packed 84-bit schedule masks (7 days x 12 slots) for fast matching
     - RESTful API ready
     - Sunday as first day (0=Sunday, 1=Monday, etc. - matching your schema)
     """
@@ -41,12 +66,93 @@ class WebScheduleMatcher:
         self.days = ['sunday', 'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday']
         self.day_numbers = {day: idx for idx, day in enumerate(self.days)}
 
+        # Packed schedule layout: slot i of day d is bit (d * 12 + i) of an 84-bit integer
+        self.slots_per_day = len(self.time_slots)
+        self.day_mask = (1 << self.slots_per_day) - 1
+        self.slot_index = {slot: idx for idx, slot in enumerate(self.time_slots)}
+        # The same slots as the data collection form stores them (its last slot ends at 23:59)
+        self.form_time_slots = self.time_slots[:-1] + [("22:00", "23:59")]
+        self.mask_bytes = (len(self.days) * self.slots_per_day + 7) // 8
+
+        # Slots normalized once to integer minute intervals (midnight wrap resolved),
+        # plus a precomputed overlap table between the standard slots
+        self._slot_minutes_cache = {}
+        self._slot_pattern_cache = {}
+        self.slot_minutes = [self._slot_to_minutes(slot) for slot in self.time_slots]
+        self.slot_overlap_table = [
+            [self._minutes_overlap(a, b) for b in self.slot_minutes] for a in self.slot_minutes
+        ]
+
         self.db_config = db_config
         self.db_connection = None
 
-        # Cache for frequently accessed data
-        self.users_cache = {}
+        # Pooled mode ('pooled': True): PostgresConnectionPool for postgresql, QueuePool for sqlalchemy.
+        # Unpooled postgresql shares one connection, so its users take this lock.
+        self.connection_pool = None
+        self._connection_lock = threading.RLock()
+        self._connect_kwargs = None
+
+        # 'rows': one sample_user_availability row per slot
+        # 'compact': one 12-bit slot_mask per (usn, day) in sample_user_availability_mask
+        self.availability_storage = (db_config or {}).get('availability_storage', 'rows')
+
+        # 'python': score loaded profiles in-process
+        # 'sql': rank candidates with a Postgres self-join, then load only the top profiles
+        self.scoring_mode = (db_config or {}).get('scoring_mode', 'python')
+
+        # Share of the recommendation score taken by the skill score (0 = schedule only).
+        # skill_mode: 'similarity' (cosine of proficiency vectors) or 'complementarity'
+        # (share of the candidate's proficiency in skills the user lacks). Needs SciPy.
+        self.skill_weight = (db_config or {}).get('skill_weight', 0.0)
+        self.skill_mode = (db_config or {}).get('skill_mode', 'similarity')
+
+        # Rows fetched per round trip when streaming large loads through server-side cursors
+        self.stream_itersize = (db_config or {}).get('stream_itersize', 2000)
+
+        # Supabase loads are paged with range headers (PostgREST caps rows per response)
+        self.page_size = (db_config or {}).get('page_size', 1000)
+        self.page_workers = (db_config or {}).get('page_workers', 4)
+
+        # Optional progress_callback(table, rows_loaded, total_rows) for long loads
+        self.progress_callback = (db_config or {}).get('progress_callback')
+
+        # SQLAlchemy loads bind ID lists as arrays, split into chunks of at most id_chunk_size
+        self.id_chunk_size = (db_config or {}).get('id_chunk_size', 5000)
+        self._statement_cache = {}
+
+        # Loaders run the users/skills and availability queries side by side on these threads
+        self._loader_executor = ThreadPoolExecutor(
+            max_workers=(db_config or {}).get('loader_workers', 8), thread_name_prefix='profile-loader'
+        )
+        self.log_load_timings = (db_config or {}).get('log_load_timings', True)
+        self.last_load_timings = {}
+
+        # Cache for frequently accessed data: usn -> (profile, expires_at, size_bytes), LRU order
+        self.users_cache = OrderedDict()
         self.cache_timestamp = None
+        self.cache_ttl_seconds = (db_config or {}).get('cache_ttl_seconds', 300)
+        self.cache_max_bytes = (db_config or {}).get('cache_max_bytes', 64 * 1024 * 1024)
+        self.cache_bytes = 0
+        self.cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0}
+        self._cache_lock = threading.Lock()
+
+        # Persistent top-k recommendation index (see build_recommendation_index); not served
+        # (and rebuilt by the change listener) once older than index_max_age_seconds
+        self.recommendation_index = None
+        self.index_max_age_seconds = (db_config or {}).get('index_max_age_seconds', 3600)
+
+        # Type-ahead skill name index (see build_skill_index)
+        self.skill_index = None
+
+        # LISTEN/NOTIFY cache invalidation (see start_change_listener)
+        self._listener_thread = None
+        self._listener_stop = threading.Event()
+        self.listener_ready = threading.Event()
+        self.listener_stats = {'notifications': 0, 'profiles_changed': 0, 'reconnects': 0, 'errors': 0}
+
+        # Query accounting: total plus a per-thread count so each API call can report its own
+        self.query_count = 0
+        self._query_local = threading.local()
 
     # ===========================================
     # DATABASE INTEGRATION METHODS
@@ -63,13 +169,30 @@ class WebScheduleMatcher:
                 import psycopg2
                 from psycopg2.extras import RealDictCursor
 
-                self.db_connection = psycopg2.connect(
-                    host=self.db_config['host'],
-                    database=self.db_config['database'],
-                    user=self.db_config['user'],
-                    password=self.db_config['password'],
-                    port=self.db_config.get('port', 5432)
-                )
+                connect_kwargs = {
+                    'host': self.db_config['host'],
+                    'database': self.db_config['database'],
+                    'user': self.db_config['user'],
+                    'password': self.db_config['password'],
+                    'port': self.db_config.get('port', 5432)
+                }
+
+                self._connect_kwargs = connect_kwargs
+
+                if self.db_config.get('pooled'):
+                    self.connection_pool = PostgresConnectionPool(
+                        connect_kwargs,
+                        min_size=self.db_config.get('pool_min_size', 1),
+                        max_size=self.db_config.get('pool_max_size', 10),
+                        timeout=self.db_config.get('pool_timeout', 30.0),
+                        health_check=self.db_config.get('pool_health_check', True),
+                        max_idle_seconds=self.db_config.get('pool_max_idle_seconds', 300.0)
+                    )
+                    self.db_connection = self.connection_pool
+                    print("Connected to PostgreSQL database (pooled)")
+                    return True
+
+                self.db_connection = psycopg2.connect(**connect_kwargs)
                 print("Connected to PostgreSQL database")
                 return True
 
@@ -77,9 +200,13 @@ class WebScheduleMatcher:
             elif self.db_config and self.db_config.get('type') == 'supabase':
                 from supabase import create_client
 
-                supabase_url = self.db_config['url']
-                supabase_key = self.db_config['service_key']
-                self.db_connection = create_client(supabase_url, supabase_key)
+                if self.db_config.get('client') is not None:
+                    # Reuse an existing client (e.g. the Streamlit app's connection)
+                    self.db_connection = self.db_config['client']
+                else:
+                    supabase_url = self.db_config['url']
+                    supabase_key = self.db_config['service_key']
+                    self.db_connection = create_client(supabase_url, supabase_key)
                 print("Connected to Supabase database")
                 return True
 
@@ -87,7 +214,18 @@ class WebScheduleMatcher:
             elif self.db_config and self.db_config.get('type') == 'sqlalchemy':
                 from sqlalchemy import create_engine
 
-                self.db_connection = create_engine(self.db_config['connection_string'])
+                engine_options = {}
+                if self.db_config.get('pooled'):
+                    # QueuePool opens connections lazily and closes overflow ones on return,
+                    # so keep all max_size connections in the pool proper
+                    engine_options = {
+                        'pool_size': self.db_config.get('pool_max_size', 10),
+                        'max_overflow': 0,
+                        'pool_timeout': self.db_config.get('pool_timeout', 30.0),
+                        'pool_pre_ping': self.db_config.get('pool_health_check', True)
+                    }
+
+                self.db_connection = create_engine(self.db_config['connection_string'], **engine_options)
                 print("Connected via SQLAlchemy")
                 return True
 
@@ -108,277 +246,768 @@ class WebScheduleMatcher:
         - sample_user_skills: usn, skill_id, proficiency_level
         - sample_user_availability: usn, day_of_week, time_slot_start, time_slot_end, is_available
         - skills: skill_id, name
+
+        Profiles are served from users_cache when fresh; only the misses
+        are fetched from the database.
         """
 
         try:
-            # Build the query based on database type
-            if self.db_config['type'] == 'postgresql':
-                return self._load_from_postgresql(user_ids)
-            elif self.db_config['type'] == 'supabase':
-                return self._load_from_supabase(user_ids)
-            elif self.db_config['type'] == 'sqlalchemy':
-                return self._load_from_sqlalchemy(user_ids)
+            if not user_ids:
+                users_data = self._load_from_database(user_ids)
+                self._cache_profiles(users_data)
+                return users_data
+
+            users_data, missing_ids = self._get_cached_profiles(user_ids)
+            if missing_ids:
+                loaded = self._load_from_database(missing_ids)
+                self._cache_profiles(loaded)
+                users_data.update(loaded)
+            return users_data
 
         except Exception as e:
             print(f"Error loading user profiles: {e}")
             return {}
 
+    def _load_from_database(self, user_ids: List[str] = None) -> Dict:
+        """Dispatch to the loader for the configured database type"""
+        # Build the query based on database type
+        if self.db_config['type'] == 'postgresql':
+            return self._load_from_postgresql(user_ids)
+        elif self.db_config['type'] == 'supabase':
+            return self._load_from_supabase(user_ids)
+        elif self.db_config['type'] == 'sqlalchemy':
+            return self._load_from_sqlalchemy(user_ids)
+        return {}
+
+    # ===========================================
+    # PROFILE CACHE (TTL + LRU, bounded by memory)
+    # ===========================================
+
+    @staticmethod
+    def _copy_profile(profile: Dict) -> Dict:
+        """Copy a profile's dicts and lists so callers cannot change the cached entry"""
+        copied = dict(profile)
+        copied['skills'] = [dict(skill) for skill in profile['skills']]
+        copied['schedule'] = dict(profile['schedule'])
+        return copied
+
+    def _get_cached_profiles(self, user_ids: List[str]) -> Tuple[Dict, List[str]]:
+        """Split requested IDs into copies of fresh cached profiles and IDs that must be loaded"""
+        found = {}
+        missing = []
+        now = time_module.monotonic()
+
+        with self._cache_lock:
+            for usn in dict.fromkeys(user_ids):
+                entry = self.users_cache.get(usn)
+                if entry is not None and entry[1] <= now:
+                    self._drop_cache_entry(usn)
+                    self.cache_stats['expirations'] += 1
+                    entry = None
+
+                if entry is None:
+                    self.cache_stats['misses'] += 1
+                    missing.append(usn)
+                else:
+                    self.cache_stats['hits'] += 1
+                    self.users_cache.move_to_end(usn)
+                    found[usn] = self._copy_profile(entry[0])
+
+        return found, missing
+
+    def _cache_profiles(self, users_data: Dict):
+        """Store freshly loaded profiles, evicting least recently used ones past the byte budget"""
+        if self.cache_ttl_seconds <= 0 or self.cache_max_bytes <= 0:
+            return
+
+        now = time_module.monotonic()
+        with self._cache_lock:
+            for usn, profile in users_data.items():
+                size = self._estimate_size(profile)
+                if size > self.cache_max_bytes:
+                    continue
+
+                self._drop_cache_entry(usn)
+                # The caller keeps the loaded dicts, so the cache holds its own copy
+                self.users_cache[usn] = (self._copy_profile(profile), now + self.cache_ttl_seconds, size)
+                self.cache_bytes += size
+
+            while self.cache_bytes > self.cache_max_bytes and self.users_cache:
+                oldest = next(iter(self.users_cache))
+                self._drop_cache_entry(oldest)
+                self.cache_stats['evictions'] += 1
+
+            self.cache_timestamp = datetime.now()
+
+    def _drop_cache_entry(self, usn: str):
+        """Remove one entry and release its bytes (caller holds the lock)"""
+        entry = self.users_cache.pop(usn, None)
+        if entry is not None:
+            self.cache_bytes -= entry[2]
+
+    def invalidate_cache(self, user_ids: List[str] = None):
+        """Drop cached profiles for the given USNs (all of them if None)"""
+        with self._cache_lock:
+            if user_ids is None:
+                self.cache_stats['invalidations'] += len(self.users_cache)
+                self.users_cache.clear()
+                self.cache_bytes = 0
+                return
+
+            for usn in user_ids:
+                if usn in self.users_cache:
+                    self._drop_cache_entry(usn)
+                    self.cache_stats['invalidations'] += 1
+
+    def get_cache_stats(self) -> Dict:
+        """Hit/miss/eviction counters and current occupancy, for tuning TTL and size"""
+        with self._cache_lock:
+            lookups = self.cache_stats['hits'] + self.cache_stats['misses']
+            return {
+                **self.cache_stats,
+                'hit_rate': round(self.cache_stats['hits'] / lookups * 100, 1) if lookups else 0.0,
+                'entries': len(self.users_cache),
+                'bytes': self.cache_bytes,
+                'max_bytes': self.cache_max_bytes,
+                'ttl_seconds': self.cache_ttl_seconds
+            }
+
+    @classmethod
+    def _estimate_size(cls, value) -> int:
+        """Approximate deep memory footprint of a profile"""
+        size = sys.getsizeof(value)
+        if isinstance(value, dict):
+            size += sum(cls._estimate_size(k) + cls._estimate_size(v) for k, v in value.items())
+        elif isinstance(value, (list, tuple, set)):
+            size += sum(cls._estimate_size(item) for item in value)
+        return size
+
+    # ===========================================
+    # PUSH INVALIDATION (LISTEN/NOTIFY)
+    # ===========================================
+
+    def start_change_listener(self, channel: str = 'profile_changes', refresh: bool = False,
+                              poll_seconds: float = 1.0) -> bool:
+        """
+        Evict cached profiles as soon as the database reports a change
+
+        Needs the triggers in SQL_scripts/profile_change_notify.sql. A daemon
+        thread LISTENs on its own connection; each notified usn is dropped
+        from users_cache (and reloaded when refresh is set), and updated in
+        the recommendation index if one is built. After a lost connection it
+        reconnects, clears the whole cache and rebuilds the index, since
+        notifications may have been missed; an index past its maximum age is
+        rebuilt too. listener_ready is set once LISTEN runs and the triggers
+        are found (see wait_for_change_listener). Works with 'postgresql' and
+        'sqlalchemy' configs.
+        """
+        if self._listener_thread is not None and self._listener_thread.is_alive():
+            return True
+
+        if not self.db_config or self.db_config.get('type') not in ('postgresql', 'sqlalchemy'):
+            print("Change listener needs a 'postgresql' or 'sqlalchemy' database configuration")
+            return False
+
+        self._listener_stop.clear()
+        self._listener_thread = threading.Thread(
+            target=self._listen_for_changes, args=(channel, refresh, poll_seconds),
+            name='profile-change-listener', daemon=True
+        )
+        self._listener_thread.start()
+        return True
+
+    def stop_change_listener(self, timeout: float = 5.0):
+        """Stop the listener thread and close its connection"""
+        self._listener_stop.set()
+        if self._listener_thread is not None:
+            self._listener_thread.join(timeout)
+            self._listener_thread = None
+        self.listener_ready.clear()
+
+    def wait_for_change_listener(self, timeout: float = 10.0) -> bool:
+        """Block until the listener is LISTENing with the triggers in place; False on timeout"""
+        return self.listener_ready.wait(timeout)
+
+    def _missing_notify_triggers(self, tables) -> List[str]:
+        """Profile tables (for the configured storage) without the notify_profile_change trigger"""
+        required = {'sample_users', 'sample_user_skills', self._availability_table()}
+        return sorted(required - set(tables))
+
+    def _open_listener_connection(self):
+        """Dedicated autocommit psycopg2 connection for LISTEN"""
+        if self.db_config['type'] == 'sqlalchemy':
+            # Take the psycopg2 connection out of the engine's pool for good
+            raw = self.db_connection.raw_connection()
+            conn = raw.driver_connection
+            raw.detach()
+        else:
+            conn = psycopg2.connect(**self._connect_kwargs)
+        conn.autocommit = True
+        return conn
+
+    def _listen_for_changes(self, channel: str, refresh: bool, poll_seconds: float):
+        """Listener thread body: wait for notifications, apply them, reconnect on failure"""
+        import select
+        from psycopg2 import sql
+
+        conn = None
+        connected_before = False
+        while not self._listener_stop.is_set():
+            try:
+                if conn is None:
+                    conn = self._open_listener_connection()
+                    with conn.cursor() as cursor:
+                        cursor.execute(sql.SQL("LISTEN {}").format(sql.Identifier(channel)))
+                        cursor.execute(_NOTIFY_TRIGGER_TABLES_SQL)
+                        missing = self._missing_notify_triggers(row[0] for row in cursor.fetchall())
+                    if connected_before:
+                        self.listener_stats['reconnects'] += 1
+                        self.invalidate_cache()
+                        self._rebuild_recommendation_index()
+                    connected_before = True
+                    if missing:
+                        print(f"No change notifications from {missing}: run SQL_scripts/profile_change_notify.sql")
+                    else:
+                        self.listener_ready.set()
+
+                index = self.recommendation_index
+                if index is not None and index.expired():
+                    self._rebuild_recommendation_index()
+
+                if not select.select([conn], [], [], poll_seconds)[0]:
+                    continue
+
+                conn.poll()
+                usns = list(dict.fromkeys(notify.payload for notify in conn.notifies))
+                self.listener_stats['notifications'] += len(conn.notifies)
+                conn.notifies.clear()
+                if usns:
+                    self._apply_profile_changes(usns, refresh)
+
+            except Exception as e:
+                print(f"Profile change listener error: {e}")
+                self.listener_stats['errors'] += 1
+                self.listener_ready.clear()
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+                    conn = None
+                self._listener_stop.wait(poll_seconds)
+
+        if conn is not None:
+            conn.close()
+
+    def _apply_profile_changes(self, usns: List[str], refresh: bool):
+        """Drop (or reload) changed profiles and patch the recommendation index"""
+        self.listener_stats['profiles_changed'] += len(usns)
+        self.invalidate_cache(usns)
+
+        index = self.recommendation_index
+        if index is not None:
+            for usn in usns:
+                index.update_user(usn)
+        elif refresh:
+            self.load_user_profiles(usns)
+
+    def _rebuild_recommendation_index(self):
+        """
+        Reload the recommendation index after notifications may have been missed
+
+        The index is marked stale first, so requests take the cache path
+        until the rebuild is done. Load errors propagate (an empty load
+        would look like an empty cohort) and leave the index stale.
+        """
+        index = self.recommendation_index
+        if index is None:
+            return
+
+        index.stale = True
+        profiles = self._load_from_database(index.source_ids)
+        self._cache_profiles(profiles)
+        index.build(index.source_ids, profiles=profiles)
+
+    @contextmanager
+    def _pg_connection(self):
+        """Borrow a pooled psycopg2 connection, or hold the shared one exclusively"""
+        if self.connection_pool is not None:
+            conn = self.connection_pool.checkout()
+            try:
+                yield conn
+            finally:
+                self.connection_pool.checkin(conn)
+        else:
+            with self._connection_lock:
+                yield self.db_connection
+
+    def get_pool_stats(self) -> Dict:
+        """Connection pool usage (empty when not pooled)"""
+        if self.connection_pool is not None:
+            return self.connection_pool.get_stats()
+
+        if self.db_config and self.db_config.get('type') == 'sqlalchemy' and self.db_connection is not None:
+            pool = self.db_connection.pool
+            if hasattr(pool, 'checkedout'):
+                return {
+                    'type': 'sqlalchemy',
+                    'pool_size': pool.size(),
+                    'in_use': pool.checkedout(),
+                    'idle': pool.checkedin(),
+                    'overflow': pool.overflow(),
+                    'status': pool.status()
+                }
+        return {}
+
+    def _should_stream(self, user_ids: List[str] = None) -> bool:
+        """Whole-cohort and large ID-list loads go through server-side cursors"""
+        return user_ids is None or len(user_ids) > self.stream_itersize
+
+    def _postgres_cursor(self, conn, name: str, stream: bool):
+        """Named (server-side) cursor fetching itersize rows per round trip, or a plain one"""
+        if stream:
+            cursor = conn.cursor(name=name, cursor_factory=psycopg2.extras.RealDictCursor)
+            cursor.itersize = self.stream_itersize
+            return cursor
+        return conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+
+    def _users_with_skills_query(self, user_filter: str = "") -> str:
+        """One row per user with skills aggregated into a JSON array"""
+        return f"""
+        SELECT
+            u.usn,
+            u.first_name,
+            u.last_name,
+            u.department,
+            u.year,
+            COALESCE(
+                JSON_AGG(
+                    JSON_BUILD_OBJECT(
+                        'skill_id', us.skill_id,
+                        'skill_name', s.name,
+                        'proficiency_level', us.proficiency_level
+                    )
+                ) FILTER (WHERE us.skill_id IS NOT NULL),
+                '[]'::json
+            ) as skills
+        FROM sample_users u
+        LEFT JOIN sample_user_skills us ON u.usn = us.usn
+        LEFT JOIN skills s ON us.skill_id = s.skill_id
+        {user_filter}
+        GROUP BY u.usn, u.first_name, u.last_name, u.department, u.year
+        """
+
     def _load_from_postgresql(self, user_ids: List[str] = None) -> Dict:
-        """Load data using direct PostgreSQL connection"""
-        users_data = {}
+        """Load data using direct PostgreSQL connection, streaming rows into users_data"""
+        stream = self._should_stream(user_ids)
 
-        with self.db_connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-            # Base query
-            user_filter = ""
-            params = []
+        # Base query
+        user_filter = ""
+        params = []
 
-            if user_ids:
-                user_filter = "WHERE u.usn = ANY(%s)"
-                params.append(user_ids)
+        if user_ids:
+            user_filter = "WHERE u.usn = ANY(%s)"
+            params.append(user_ids)
 
-            # Get user basic info with skills
-            query = f"""
-            SELECT
-                u.usn,
-                u.first_name,
-                u.last_name,
-                u.department,
-                u.year,
-                COALESCE(
-                    JSON_AGG(
-                        JSON_BUILD_OBJECT(
-                            'skill_id', us.skill_id,
-                            'skill_name', s.name,
-                            'proficiency_level', us.proficiency_level
-                        )
-                    ) FILTER (WHERE us.skill_id IS NOT NULL),
-                    '[]'::json
-                ) as skills
-            FROM sample_users u
-            LEFT JOIN sample_user_skills us ON u.usn = us.usn
-            LEFT JOIN skills s ON us.skill_id = s.skill_id
-            {user_filter}
-            GROUP BY u.usn, u.first_name, u.last_name, u.department, u.year
-            """
+        # Get user basic info with skills
+        query = self._users_with_skills_query(user_filter)
 
-            cursor.execute(query, params)
-            users = cursor.fetchall()
+        # Get availability data separately
+        availability_filter = ""
+        if user_ids:
+            availability_filter = "WHERE usn = ANY(%s)"
 
-            # Get availability data separately
-            availability_filter = ""
-            if user_ids:
-                availability_filter = "WHERE usn = ANY(%s)"
+        availability_query = f"""
+        {self._availability_select()}
+        {availability_filter}
+        ORDER BY usn, day_of_week
+        """
 
-            availability_query = f"""
-            SELECT usn, day_of_week, time_slot_start, time_slot_end, is_available
-            FROM sample_user_availability
-            {availability_filter}
-            ORDER BY usn, day_of_week, time_slot_start
-            """
+        def load_users():
+            users_data = {}
+            with self._pg_connection() as conn:
+                with self._postgres_cursor(conn, 'profile_users', stream) as cursor:
+                    cursor.execute(query, params)
+                    self._count_query()
+
+                    # Process users data one batch at a time
+                    for user in cursor:
+                        full_name = f"{user['first_name']} {user['last_name']}"
+                        users_data[user['usn']] = {
+                            'name': full_name,
+                            'first_name': user['first_name'],
+                            'last_name': user['last_name'],
+                            'department': user['department'],
+                            'year': user['year'],
+                            'skills': user['skills'] if user['skills'] else [],
+                            'schedule': self._initialize_empty_schedule()
+                        }
+            return users_data
+
+        def load_schedules():
+            schedules = {}
+            with self._pg_connection() as conn:
+                with self._postgres_cursor(conn, 'profile_availability', stream) as cursor:
+                    cursor.execute(availability_query, params)
+                    self._count_query()
+
+                    # Fold each row into the packed schedule as it arrives
+                    for avail in cursor:
+                        self._collect_availability(schedules, avail)
+            return schedules
+
+        # The shared unpooled connection can only run one query at a time
+        return self._run_profile_load(load_users, load_schedules, parallel=self.connection_pool is not None)
+
+    def _fetch_supabase_pages(self, build_query, table: str, handle_rows):
+        """
+        Fetch every row of a query in page_size ranges and pass each page to handle_rows.
+        The first page also returns the exact row count; the rest are fetched concurrently.
+        """
+        page_size = self.page_size
+        first = build_query(count='exact').range(0, page_size - 1).execute()
+        self._count_query()
+
+        loaded = len(first.data)
+        total = first.count if first.count is not None else loaded
+        handle_rows(first.data)
+        self._report_progress(table, loaded, total)
+
+        # A server-side max-rows cap smaller than page_size would otherwise leave gaps
+        if 0 < loaded < min(page_size, total):
+            page_size = loaded
+
+        starts = range(loaded, total, page_size)
+        if not starts:
+            return
+
+        def fetch_page(start):
+            return build_query().range(start, start + page_size - 1).execute()
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.page_workers, len(starts)))) as pool:
+            futures = [pool.submit(fetch_page, start) for start in starts]
+            for future in as_completed(futures):
+                rows = future.result().data
+                self._count_query()
+                handle_rows(rows)
+                loaded += len(rows)
+                self._report_progress(table, loaded, total)
+
+    def _report_progress(self, table: str, loaded: int, total: int):
+        """Forward loader progress to the configured callback, if any"""
+        if self.progress_callback is None:
+            return
+        try:
+            self.progress_callback(table, loaded, total)
+        except Exception as e:
+            print(f"Progress callback failed: {e}")
+
+    def _load_from_supabase(self, user_ids: List[str] = None) -> Dict:
+        """Load data using Supabase client, paging through both tables concurrently"""
 
-            cursor.execute(availability_query, params)
-            availability_data = cursor.fetchall()
+        # Get users with skills
+        def users_query(count=None):
+            query = self.db_connection.table('sample_users').select('''
+                *,
+                sample_user_skills(*, skills(*))
+            ''', count=count)
+            if user_ids:
+                query = query.in_('usn', user_ids)
+            return query.order('usn')
 
-            # Process users data
-            for user in users:
+        def add_users(users_data, rows):
+            for user in rows:
                 full_name = f"{user['first_name']} {user['last_name']}"
+                skills = []
+
+                for user_skill in user.get('sample_user_skills', []):
+                    if user_skill.get('skills'):
+                        skills.append({
+                            'skill_id': user_skill['skill_id'],
+                            'skill_name': user_skill['skills']['name'],
+                            'proficiency_level': user_skill['proficiency_level']
+                        })
+
                 users_data[user['usn']] = {
                     'name': full_name,
                     'first_name': user['first_name'],
                     'last_name': user['last_name'],
                     'department': user['department'],
                     'year': user['year'],
-                    'skills': user['skills'] if user['skills'] else [],
+                    'skills': skills,
                     'schedule': self._initialize_empty_schedule()
                 }
 
-            # Process availability data
-            for avail in availability_data:
-                usn = avail['usn']
-                day_num = avail['day_of_week']
-                start_time = avail['time_slot_start']
-                end_time = avail['time_slot_end']
-                is_available = avail['is_available']
-
-                if usn in users_data and 0 <= day_num <= 6:
-                    day_name = self.days[day_num]
-                    time_slot = (start_time.strftime('%H:%M'), end_time.strftime('%H:%M'))
-
-                    if is_available:
-                        users_data[usn]['schedule'][day_name]['available'].add(time_slot)
-                        users_data[usn]['schedule'][day_name]['valid'].add(time_slot)
-                    else:
-                        users_data[usn]['schedule'][day_name]['avoid'].add(time_slot)
-                        users_data[usn]['schedule'][day_name]['valid'].discard(time_slot)
+        def load_users():
+            users_data = {}
+            self._fetch_supabase_pages(users_query, 'sample_users', lambda rows: add_users(users_data, rows))
+            return users_data
 
-        return users_data
+        # Get availability data, ordered on the table key so pages never overlap
+        availability_table = self._availability_table()
+        order_columns = ['usn', 'day_of_week']
+        if self.availability_storage != 'compact':
+            order_columns += ['time_slot_start', 'time_slot_end']
 
-    def _load_from_supabase(self, user_ids: List[str] = None) -> Dict:
-        """Load data using Supabase client"""
-        users_data = {}
+        def availability_query(count=None):
+            query = self.db_connection.table(availability_table).select('*', count=count)
+            if user_ids:
+                query = query.in_('usn', user_ids)
+            for column in order_columns:
+                query = query.order(column)
+            return query
 
-        # Get users with skills
-        if user_ids:
-            users_query = self.db_connection.table('sample_users').select('''
-                *,
-                sample_user_skills(*, skills(*))
-            ''').in_('usn', user_ids)
-        else:
-            users_query = self.db_connection.table('sample_users').select('''
-                *,
-                sample_user_skills(*, skills(*))
-            ''')
+        def load_schedules():
+            schedules = {}
 
-        users_result = users_query.execute()
+            def add_availability(rows):
+                for avail in rows:
+                    self._collect_availability(schedules, avail)
 
-        # Get availability data
-        if user_ids:
-            availability_query = self.db_connection.table('sample_user_availability').select('*').in_('usn', user_ids)
-        else:
-            availability_query = self.db_connection.table('sample_user_availability').select('*')
+            self._fetch_supabase_pages(availability_query, availability_table, add_availability)
+            return schedules
 
-        availability_result = availability_query.execute()
+        return self._run_profile_load(load_users, load_schedules)
 
-        # Process users
-        for user in users_result.data:
-            full_name = f"{user['first_name']} {user['last_name']}"
-            skills = []
+    def _sql_statement(self, query: str):
+        """Compiled text() construct for a query string, built once and reused"""
+        statement = self._statement_cache.get(query)
+        if statement is None:
+            from sqlalchemy import text
 
-            for user_skill in user.get('sample_user_skills', []):
-                if user_skill.get('skills'):
-                    skills.append({
-                        'skill_id': user_skill['skill_id'],
-                        'skill_name': user_skill['skills']['name'],
-                        'proficiency_level': user_skill['proficiency_level']
-                    })
+            statement = self._statement_cache[query] = text(query)
+        return statement
 
-            users_data[user['usn']] = {
-                'name': full_name,
-                'first_name': user['first_name'],
-                'last_name': user['last_name'],
-                'department': user['department'],
-                'year': user['year'],
-                'skills': skills,
-                'schedule': self._initialize_empty_schedule()
-            }
+    def _load_from_sqlalchemy(self, user_ids: List[str] = None) -> Dict:
+        """Load data using SQLAlchemy (works with both PostgreSQL and Supabase), streaming large loads"""
+        if user_ids and len(user_ids) > self.id_chunk_size:
+            users_data = {}
+            for start in range(0, len(user_ids), self.id_chunk_size):
+                users_data.update(self._load_sqlalchemy_chunk(user_ids[start:start + self.id_chunk_size]))
+            return users_data
 
-        # Process availability
-        for avail in availability_result.data:
-            usn = avail['usn']
-            day_num = avail['day_of_week']
-            start_time = avail['time_slot_start']
-            end_time = avail['time_slot_end']
-            is_available = avail['is_available']
-
-            if usn in users_data and 0 <= day_num <= 6:
-                day_name = self.days[day_num]
-                time_slot = (start_time, end_time)
-
-                if is_available:
-                    users_data[usn]['schedule'][day_name]['available'].add(time_slot)
-                    users_data[usn]['schedule'][day_name]['valid'].add(time_slot)
-                else:
-                    users_data[usn]['schedule'][day_name]['avoid'].add(time_slot)
-                    users_data[usn]['schedule'][day_name]['valid'].discard(time_slot)
+        return self._load_sqlalchemy_chunk(user_ids)
 
-        return users_data
+    def _load_sqlalchemy_chunk(self, user_ids: List[str] = None) -> Dict:
+        """Load one bounded batch of profiles with bound-array statements"""
 
-    def _load_from_sqlalchemy(self, user_ids: List[str] = None) -> Dict:
-        """Load data using SQLAlchemy (works with both PostgreSQL and Supabase)"""
-        users_data = {}
+        # Build user filter; the ID list is a single array parameter so the statement text never changes
+        user_filter = ""
+        params = {}
+        if user_ids:
+            user_filter = "WHERE u.usn = ANY(:usns)"
+            params['usns'] = list(user_ids)
 
-        with self.db_connection.connect() as conn:
-            # Build user filter
-            user_filter = ""
-            if user_ids:
-                user_ids_str = "', '".join(user_ids)
-                user_filter = f"WHERE u.usn IN ('{user_ids_str}')"
+        # Get users with skills
+        query = f"""
+        SELECT
+            u.usn,
+            u.first_name,
+            u.last_name,
+            u.department,
+            u.year,
+            us.skill_id,
+            s.name as skill_name,
+            us.proficiency_level
+        FROM sample_users u
+        LEFT JOIN sample_user_skills us ON u.usn = us.usn
+        LEFT JOIN skills s ON us.skill_id = s.skill_id
+        {user_filter}
+        ORDER BY u.usn
+        """
 
-            # Get users with skills
-            query = f"""
-            SELECT
-                u.usn,
-                u.first_name,
-                u.last_name,
-                u.department,
-                u.year,
-                us.skill_id,
-                s.name as skill_name,
-                us.proficiency_level
-            FROM sample_users u
-            LEFT JOIN sample_user_skills us ON u.usn = us.usn
-            LEFT JOIN skills s ON us.skill_id = s.skill_id
-            {user_filter}
-            ORDER BY u.usn
-            """
+        # Get availability data
+        availability_query = f"""
+        {self._availability_select()}
+        {user_filter.replace('u.usn', 'usn')}
+        ORDER BY usn, day_of_week
+        """
 
-            result = conn.execute(text(query))
-
-            # Process users and skills
-            current_user = None
-            for row in result:
-                if current_user != row.usn:
-                    full_name = f"{row.first_name} {row.last_name}"
-                    users_data[row.usn] = {
-                        'name': full_name,
-                        'first_name': row.first_name,
-                        'last_name': row.last_name,
-                        'department': row.department,
-                        'year': row.year,
-                        'skills': [],
-                        'schedule': self._initialize_empty_schedule()
-                    }
-                    current_user = row.usn
-
-                if row.skill_name:
-                    users_data[row.usn]['skills'].append({
-                        'skill_id': row.skill_id,
-                        'skill_name': row.skill_name,
-                        'proficiency_level': row.proficiency_level
-                    })
-
-            # Get availability data
-            availability_query = f"""
-            SELECT usn, day_of_week, time_slot_start, time_slot_end, is_available
-            FROM sample_user_availability
-            {user_filter.replace('u.usn', 'usn') if user_filter else ''}
-            ORDER BY usn, day_of_week, time_slot_start
-            """
+        stream = self._should_stream(user_ids)
+
+        def connect():
+            conn = self.db_connection.connect()
+            if stream:
+                # Server-side cursor: rows are buffered up to itersize instead of fetched at once
+                conn = conn.execution_options(stream_results=True, max_row_buffer=self.stream_itersize)
+            return conn
+
+        def load_users():
+            users_data = {}
+            with connect() as conn:
+                result = conn.execute(self._sql_statement(query), params)
+                self._count_query()
+
+                # Process users and skills
+                current_user = None
+                for row in result:
+                    if current_user != row.usn:
+                        full_name = f"{row.first_name} {row.last_name}"
+                        users_data[row.usn] = {
+                            'name': full_name,
+                            'first_name': row.first_name,
+                            'last_name': row.last_name,
+                            'department': row.department,
+                            'year': row.year,
+                            'skills': [],
+                            'schedule': self._initialize_empty_schedule()
+                        }
+                        current_user = row.usn
+
+                    if row.skill_name:
+                        users_data[row.usn]['skills'].append({
+                            'skill_id': row.skill_id,
+                            'skill_name': row.skill_name,
+                            'proficiency_level': row.proficiency_level
+                        })
+            return users_data
+
+        def load_schedules():
+            schedules = {}
+            with connect() as conn:
+                availability_result = conn.execute(self._sql_statement(availability_query), params)
+                self._count_query()
+
+                # Process availability
+                for row in availability_result:
+                    self._collect_availability(schedules, row._mapping)
+            return schedules
+
+        return self._run_profile_load(load_users, load_schedules)
+
+    def _run_profile_load(self, load_users, load_schedules, parallel: bool = True) -> Dict:
+        """
+        Run a loader's users/skills step and its availability step, then merge them
 
-            availability_result = conn.execute(text(availability_query))
+        With parallel=True the availability step runs on a loader thread while
+        the users step runs here, so a load takes max(q1, q2) instead of
+        q1 + q2. Queries issued on the loader thread are credited to the
+        caller's per-thread count. The timing breakdown is kept in
+        last_load_timings and printed when log_load_timings is set.
+        """
+        started = time_module.monotonic()
 
-            # Process availability
-            for row in availability_result:
-                usn = row.usn
-                day_num = row.day_of_week
-                start_time = row.time_slot_start
-                end_time = row.time_slot_end
-                is_available = row.is_available
+        def timed_schedules():
+            step_started = time_module.monotonic()
+            queries_before = self.get_thread_query_count()
+            schedules = load_schedules()
+            return (schedules, time_module.monotonic() - step_started,
+                    self.get_thread_query_count() - queries_before)
 
-                if usn in users_data and 0 <= day_num <= 6:
-                    day_name = self.days[day_num]
-                    # Convert time objects to string format
-                    time_slot = (start_time.strftime('%H:%M'), end_time.strftime('%H:%M'))
+        future = self._loader_executor.submit(timed_schedules) if parallel else None
 
-                    if is_available:
-                        users_data[usn]['schedule'][day_name]['available'].add(time_slot)
-                        users_data[usn]['schedule'][day_name]['valid'].add(time_slot)
-                    else:
-                        users_data[usn]['schedule'][day_name]['avoid'].add(time_slot)
-                        users_data[usn]['schedule'][day_name]['valid'].discard(time_slot)
+        users_started = time_module.monotonic()
+        users_data = load_users()
+        users_seconds = time_module.monotonic() - users_started
+
+        if future is not None:
+            schedules, availability_seconds, queries = future.result()
+            self._query_local.count = self.get_thread_query_count() + queries
+        else:
+            schedules, availability_seconds, _ = timed_schedules()
+
+        merge_started = time_module.monotonic()
+        for usn, entry in schedules.items():
+            if usn in users_data:
+                users_data[usn]['schedule'] = entry['schedule']
+        merge_seconds = time_module.monotonic() - merge_started
+
+        self.last_load_timings = timings = {
+            'profiles': len(users_data),
+            'parallel': parallel,
+            'users_ms': round(users_seconds * 1000, 1),
+            'availability_ms': round(availability_seconds * 1000, 1),
+            'merge_ms': round(merge_seconds * 1000, 1),
+            'total_ms': round((time_module.monotonic() - started) * 1000, 1)
+        }
+        if self.log_load_timings:
+            print(f"Loaded {timings['profiles']} profiles in {timings['total_ms']} ms "
+                  f"(users+skills {timings['users_ms']} ms, availability {timings['availability_ms']} ms, "
+                  f"merge {timings['merge_ms']} ms{', parallel' if parallel else ''})")
 
         return users_data
 
+    def _collect_availability(self, schedules: Dict, record):
+        """Fold one availability row into a usn -> {'schedule': ...} map built before the users are known"""
+        usn = record['usn']
+        if usn not in schedules:
+            schedules[usn] = {'schedule': self._initialize_empty_schedule()}
+        self._apply_availability_record(schedules, record)
+
     def _initialize_empty_schedule(self) -> Dict:
-        """Initialize empty schedule structure"""
-        schedule = {}
-        for day in self.days:
-            schedule[day] = {
-                'available': set(),  # Start with empty, populate from DB
-                'avoid': set(),
-                'valid': set()
-            }
-        return schedule
+        """
+        Initialize empty packed schedule structure
+
+        Each entry is an 84-bit integer (7 days x 12 slots): slot i of
+        day d is bit (d * 12 + i). Start with empty, populate from DB.
+        """
+        return {
+            'available': 0,
+            'avoid': 0,
+            'valid': 0
+        }
+
+    def _availability_table(self) -> str:
+        """Table holding availability for the configured storage layout"""
+        if self.availability_storage == 'compact':
+            return 'sample_user_availability_mask'
+        return 'sample_user_availability'
+
+    def _availability_select(self) -> str:
+        """SELECT ... FROM clause for the configured availability storage"""
+        if self.availability_storage == 'compact':
+            return "SELECT usn, day_of_week, slot_mask FROM sample_user_availability_mask"
+        return ("SELECT usn, day_of_week, time_slot_start, time_slot_end, is_available "
+                "FROM sample_user_availability")
+
+    def _apply_availability_record(self, users_data: Dict, record):
+        """Apply one availability row (per-slot or compact per-day) to a loaded profile"""
+        usn = record['usn']
+        day_num = record['day_of_week']
+
+        if usn not in users_data or not 0 <= day_num <= 6:
+            return
+
+        schedule = users_data[usn]['schedule']
+        if 'slot_mask' in record:
+            self._apply_day_mask(schedule, day_num, record['slot_mask'])
+        else:
+            self._apply_availability(
+                schedule, day_num,
+                record['time_slot_start'], record['time_slot_end'], record['is_available']
+            )
+
+    def _apply_day_mask(self, schedule: Dict, day_num: int, slot_mask: int):
+        """Set a whole day from a compact 12-bit mask (clear bits are stored as unavailable)"""
+        shift = day_num * self.slots_per_day
+        available = (slot_mask & self.day_mask) << shift
+        day_bits = self.day_mask << shift
+
+        schedule['available'] = (schedule['available'] & ~day_bits) | available
+        schedule['valid'] = (schedule['valid'] & ~day_bits) | available
+        schedule['avoid'] = (schedule['avoid'] & ~day_bits) | (day_bits & ~available)
+
+    def _apply_availability(self, schedule: Dict, day_num: int, start_time, end_time,
+                            is_available: bool):
+        """Set the bits for one sample_user_availability row on a packed schedule"""
+        time_slot = (self._format_slot_time(start_time), self._format_slot_time(end_time))
+        bits = self._slot_bits(day_num, time_slot)
+
+        if is_available:
+            schedule['available'] |= bits
+            schedule['valid'] |= bits
+        else:
+            schedule['avoid'] |= bits
+            schedule['valid'] &= ~bits
+
+    def _count_query(self, count: int = 1):
+        """Record database round trips issued by the loaders"""
+        self.query_count += count
+        self._query_local.count = self.get_thread_query_count() + count
+
+    def get_thread_query_count(self) -> int:
+        """Queries issued so far by the calling thread (diff two readings to count one call)"""
+        return getattr(self._query_local, 'count', 0)
 
     # ===========================================
     # UTILITY METHODS FOR TIME SLOTS
@@ -395,35 +1024,119 @@ class WebScheduleMatcher:
             return (start.strip(), end.strip())
         return time_string, time_string
 
-    def get_overlapping_slots(self, slot1: Tuple[str, str], slot2: Tuple[str, str]) -> bool:
-        """Check if two time slots overlap"""
-        start1, end1 = slot1
-        start2, end2 = slot2
+    def _format_slot_time(self, value) -> str:
+        """Normalize a DB time value (time object or 'HH:MM[:SS]' string) to 'HH:MM'"""
+        if isinstance(value, str):
+            return value[:5]
+        return value.strftime('%H:%M')
 
-        # Convert to minutes for easier comparison
-        def time_to_minutes(time_str):
-            hours, minutes = map(int, time_str.split(':'))
-            return hours * 60 + minutes
+    def _slot_bits(self, day_num: int, time_slot: Tuple[str, str]) -> int:
+        """
+        Packed bits of the standard slots covered by a stored time slot on a day
+
+        Exact standard slots map to a single bit; anything else (e.g. the
+        form's 22:00-23:59 slot) sets every standard slot it overlaps.
+        """
+        shift = day_num * self.slots_per_day
+        slot_idx = self.slot_index.get(time_slot)
+        if slot_idx is not None:
+            return 1 << (shift + slot_idx)
+
+        # Day-independent 12-bit pattern, computed once per distinct slot
+        pattern = self._slot_pattern_cache.get(time_slot)
+        if pattern is None:
+            minutes = self._slot_to_minutes(time_slot)
+            pattern = 0
+            for idx, standard_minutes in enumerate(self.slot_minutes):
+                if self._minutes_overlap(minutes, standard_minutes):
+                    pattern |= 1 << idx
+            self._slot_pattern_cache[time_slot] = pattern
+        return pattern << shift
+
+    def _day_bits(self, mask: int, day: str) -> int:
+        """Extract the 12-bit slot mask of one day from a packed schedule mask"""
+        return (mask >> (self.day_numbers[day] * self.slots_per_day)) & self.day_mask
+
+    @staticmethod
+    def _popcount(mask: int) -> int:
+        """Number of set bits in a packed mask"""
+        return bin(mask).count('1')
+
+    def unpack_schedule(self, schedule: Dict) -> Dict:
+        """Expand a packed schedule into per-day sets of time slot tuples (for display)"""
+        unpacked = {}
+        for day in self.days:
+            unpacked[day] = {}
+            for key in ('available', 'avoid', 'valid'):
+                day_bits = self._day_bits(schedule[key], day)
+                unpacked[day][key] = {
+                    slot for idx, slot in enumerate(self.time_slots) if day_bits >> idx & 1
+                }
+        return unpacked
+
+    def build_availability_matrix(self, masks: List[int], preferred_days: List[str] = None) -> np.ndarray:
+        """
+        Unpack packed availability masks into a uint8 matrix
 
-        start1_min = time_to_minutes(start1)
-        end1_min = time_to_minutes(end1)
-        start2_min = time_to_minutes(start2)
-        end2_min = time_to_minutes(end2)
+        Row r is masks[r]; columns are the 12 slots of each preferred day in
+        order (all 84 slots by default).
+        """
+        return self._unpack_mask_matrix(self._pack_masks(masks), preferred_days)
+
+    def _pack_masks(self, masks: List[int]) -> np.ndarray:
+        """N x mask_bytes little-endian byte matrix (the compact form shipped to batch workers)"""
+        packed = b''.join(mask.to_bytes(self.mask_bytes, 'little') for mask in masks)
+        return np.frombuffer(packed, dtype=np.uint8).reshape(len(masks), self.mask_bytes)
+
+    def _unpack_mask_matrix(self, bytes_matrix: np.ndarray, preferred_days: List[str] = None) -> np.ndarray:
+        """Expand a _pack_masks byte matrix into the preferred days' slot columns"""
+        if preferred_days is None:
+            preferred_days = self.days
+
+        bits = np.unpackbits(bytes_matrix, axis=1, bitorder='little')
+
+        columns = [self.day_numbers[day] * self.slots_per_day + idx
+                   for day in preferred_days for idx in range(self.slots_per_day)]
+        return bits[:, columns]
+
+    def _slot_to_minutes(self, time_slot: Tuple[str, str]) -> Tuple[int, int]:
+        """Convert a slot to an integer (start, end) minute interval, parsed once per distinct slot"""
+        minutes = self._slot_minutes_cache.get(time_slot)
+        if minutes is None:
+            start_min, end_min = (
+                int(hours) * 60 + int(mins)
+                for hours, mins in (time_str.split(':')[:2] for time_str in time_slot)
+            )
+
+            # Handle midnight crossover
+            if end_min <= start_min:
+                end_min += 24 * 60
+
+            minutes = (start_min, end_min)
+            self._slot_minutes_cache[time_slot] = minutes
+        return minutes
+
+    @staticmethod
+    def _minutes_overlap(minutes1: Tuple[int, int], minutes2: Tuple[int, int]) -> bool:
+        """Check if two integer minute intervals overlap"""
+        return not (minutes1[1] <= minutes2[0] or minutes2[1] <= minutes1[0])
 
-        # Handle midnight crossover
-        if end1_min <= start1_min:  # Crosses midnight
-            end1_min += 24 * 60
-        if end2_min <= start2_min:  # Crosses midnight
-            end2_min += 24 * 60
+    def get_overlapping_slots(self, slot1: Tuple[str, str], slot2: Tuple[str, str]) -> bool:
+        """Check if two time slots overlap"""
+        idx1 = self.slot_index.get(slot1)
+        idx2 = self.slot_index.get(slot2)
+        if idx1 is not None and idx2 is not None:
+            return self.slot_overlap_table[idx1][idx2]
 
-        return not (end1_min <= start2_min or end2_min <= start1_min)
+        return self._minutes_overlap(self._slot_to_minutes(slot1), self._slot_to_minutes(slot2))
 
     # ===========================================
     # CORE MATCHING ALGORITHMS
     # ===========================================
 
     def calculate_schedule_match_percentage(self, user1_id: str, user2_id: str,
-                                          preferred_days: List[str] = None) -> Dict:
+                                          preferred_days: List[str] = None,
+                                          users_data: Dict = None) -> Dict:
         """
         Calculate schedule match percentage between two users
         Used for profile recommendations
@@ -433,10 +1146,13 @@ class WebScheduleMatcher:
         - common_slots: Number of overlapping time slots
         - day_breakdown: Per-day analysis
         - meeting_potential: Quality score for team formation
+
+        Pass users_data to score already-loaded profiles without a database load.
         """
 
         # Load user data if not in cache
-        users_data = self.load_user_profiles([user1_id, user2_id])
+        if users_data is None:
+            users_data = self.load_user_profiles([user1_id, user2_id])
 
         if user1_id not in users_data or user2_id not in users_data:
             return {
@@ -445,6 +1161,23 @@ class WebScheduleMatcher:
                 'common_slots': 0
             }
 
+        skill_scores = self._skill_scores(users_data[user1_id], [users_data[user2_id]])
+        return self.score_schedule_match(
+            users_data[user1_id], users_data[user2_id], preferred_days,
+            skill_score=None if skill_scores is None else float(skill_scores[0])
+        )
+
+    def score_schedule_match(self, user1_profile: Dict, user2_profile: Dict,
+                             preferred_days: List[str] = None,
+                             skill_score: Optional[float] = None) -> Dict:
+        """
+        Calculate schedule match between two already-loaded profiles
+
+        Same result as calculate_schedule_match_percentage, without touching
+        the database. Use this when scoring many pairs from one bulk load.
+        A skill_score (0-100, see score_skills_against_candidates) is reported
+        and blended into recommendation_score by skill_weight.
+        """
         if preferred_days is None:
             preferred_days = self.days
 
@@ -452,30 +1185,21 @@ class WebScheduleMatcher:
         common_slots = 0
         day_breakdown = {}
 
-        for day in preferred_days:
-            user1_available = users_data[user1_id]['schedule'][day]['available']
-            user2_available = users_data[user2_id]['schedule'][day]['available']
-
-            # Find overlapping time slots
-            day_common = 0
-            day_total = len(self.time_slots)
+        user1_available = user1_profile['schedule']['available']
+        user2_available = user2_profile['schedule']['available']
+        common_mask = user1_available & user2_available
 
-            for slot in self.time_slots:
-                if slot in user1_available and slot in user2_available:
-                    day_common += 1
-
-            # Also check for partial overlaps in custom time slots
-            for slot1 in user1_available:
-                for slot2 in user2_available:
-                    if slot1 != slot2 and self.get_overlapping_slots(slot1, slot2):
-                        day_common += 0.5  # Partial credit for overlapping but not exact slots
+        for day in preferred_days:
+            # Overlapping time slots are the set bits of the ANDed masks
+            day_common = self._popcount(self._day_bits(common_mask, day))
+            day_total = self.slots_per_day
 
             day_breakdown[day] = {
-                'common_slots': int(day_common),
+                'common_slots': day_common,
                 'total_possible': day_total,
                 'day_percentage': (day_common / day_total * 100) if day_total > 0 else 0,
-                'user1_available': len(user1_available),
-                'user2_available': len(user2_available)
+                'user1_available': self._popcount(self._day_bits(user1_available, day)),
+                'user2_available': self._popcount(self._day_bits(user2_available, day))
             }
 
             common_slots += day_common
@@ -487,18 +1211,26 @@ class WebScheduleMatcher:
         # Calculate meeting potential (weighted score)
         meeting_potential = self._calculate_meeting_potential(day_breakdown)
 
-        return {
+        result = {
             'match_percentage': round(match_percentage, 1),
             'common_slots': int(common_slots),
             'total_possible_slots': total_possible_slots,
             'day_breakdown': day_breakdown,
             'meeting_potential': meeting_potential,
-            'recommendation_score': self._calculate_recommendation_score(match_percentage, meeting_potential)
+            'recommendation_score': self._calculate_recommendation_score(
+                match_percentage, meeting_potential, skill_score
+            )
         }
+        if skill_score is not None:
+            result['skill_score'] = round(skill_score, 1)
+        return result
 
     def get_profile_recommendations(self, user_id: str, candidate_ids: List[str],
                                   preferred_days: List[str] = None,
-                                  min_match_threshold: float = 20.0) -> List[Dict]:
+                                  min_match_threshold: float = 20.0,
+                                  limit: Optional[int] = None,
+                                  scoring_mode: str = None,
+                                  users_data: Dict = None) -> List[Dict]:
         """
         Get recommended profiles based on schedule compatibility
 
@@ -507,234 +1239,2101 @@ class WebScheduleMatcher:
         - candidate_ids: List of potential teammate IDs
         - preferred_days: Days to consider for matching
         - min_match_threshold: Minimum match percentage to include
+        - limit: Return only the top `limit` profiles (partial selection, no full sort)
+        - scoring_mode: 'python' or 'sql' (defaults to db_config['scoring_mode'])
+        - users_data: Already-loaded profiles (skips the database load, scores in Python)
 
         Returns list of recommendations sorted by compatibility
         """
 
-        recommendations = []
+        # The SQL ranking only sees schedules, so skill-weighted scoring stays in Python
+        if (users_data is None and (scoring_mode or self.scoring_mode) == 'sql' and not self.skill_weight
+                and self.db_config['type'] in ('postgresql', 'sqlalchemy')):
+            return self._get_profile_recommendations_sql(
+                user_id, candidate_ids, preferred_days, min_match_threshold, limit
+            )
+
+        recommendations = []
+
+        # Load all required user data
+        if users_data is None:
+            all_user_ids = [user_id] + candidate_ids
+            users_data = self.load_user_profiles(all_user_ids)
+
+        if user_id not in users_data:
+            return [{'error': 'User not found'}]
+
+        user_profile = users_data[user_id]
+        scored_ids = [candidate_id for candidate_id in candidate_ids
+                      if candidate_id != user_id and candidate_id in users_data]
+
+        # One sparse matrix-vector product for every candidate's skill score
+        skill_scores = self._skill_scores(user_profile, [users_data[candidate_id] for candidate_id in scored_ids])
+
+        for position, candidate_id in enumerate(scored_ids):
+            # Calculate schedule match from the bulk-loaded profiles (no per-candidate queries)
+            match_result = self.score_schedule_match(
+                user_profile, users_data[candidate_id], preferred_days,
+                skill_score=None if skill_scores is None else float(skill_scores[position])
+            )
+
+            if match_result['match_percentage'] >= min_match_threshold:
+                recommendations.append(
+                    self._build_recommendation(candidate_id, users_data[candidate_id], match_result)
+                )
+
+        # Sort by recommendation score (descending)
+        if limit is not None:
+            return heapq.nlargest(limit, recommendations, key=lambda x: x['recommendation_priority'])
+
+        recommendations.sort(key=lambda x: x['recommendation_priority'], reverse=True)
+
+        return recommendations
+
+    def _get_profile_recommendations_sql(self, user_id: str, candidate_ids: List[str],
+                                         preferred_days: List[str] = None,
+                                         min_match_threshold: float = 20.0,
+                                         limit: Optional[int] = None) -> List[Dict]:
+        """
+        Rank candidates from server-side common-slot counts
+
+        Only the ranked survivors' profiles are loaded, and their entries are
+        built with score_schedule_match, so results match the Python path.
+        With no candidate_ids the whole cohort is ranked; candidates with no
+        common slot at all only appear when listed in candidate_ids.
+        """
+        if preferred_days is None:
+            preferred_days = self.days
+
+        if user_id not in self.load_user_profiles([user_id]):
+            return [{'error': 'User not found'}]
+
+        day_counts = self.get_common_slot_counts_sql(user_id, candidate_ids or None, preferred_days)
+        ordered_ids = list(dict.fromkeys(candidate_ids)) if candidate_ids else list(day_counts)
+
+        ranked = []
+        for candidate_id in ordered_ids:
+            if candidate_id == user_id:
+                continue
+
+            match_percentage, score = self._score_day_counts(day_counts.get(candidate_id, {}), preferred_days)
+            if match_percentage >= min_match_threshold:
+                ranked.append((score, candidate_id))
+
+        if limit is not None:
+            ranked = heapq.nlargest(limit, ranked, key=lambda entry: entry[0])
+        else:
+            ranked.sort(key=lambda entry: entry[0], reverse=True)
+
+        users_data = self.load_user_profiles([user_id] + [candidate_id for _, candidate_id in ranked])
+        return [
+            self._build_recommendation(
+                candidate_id, users_data[candidate_id],
+                self.score_schedule_match(users_data[user_id], users_data[candidate_id], preferred_days)
+            )
+            for _, candidate_id in ranked if candidate_id in users_data
+        ]
+
+    def _score_day_counts(self, day_counts: Dict[int, int], preferred_days: List[str]) -> Tuple[float, float]:
+        """(rounded match_percentage, recommendation_score) from per-day common slot counts"""
+        total_possible_slots = self.slots_per_day * len(preferred_days)
+        common_slots = 0
+        day_breakdown = {}
+
+        for day in preferred_days:
+            day_common = day_counts.get(self.day_numbers[day], 0)
+            day_breakdown[day] = {
+                'common_slots': day_common,
+                'day_percentage': day_common / self.slots_per_day * 100
+            }
+            common_slots += day_common
+
+        match_percentage = (common_slots / total_possible_slots * 100) if total_possible_slots > 0 else 0
+        meeting_potential = self._calculate_meeting_potential(day_breakdown)
+        return (round(match_percentage, 1),
+                self._calculate_recommendation_score(match_percentage, meeting_potential))
+
+    def get_common_slot_counts_sql(self, user_id: str, candidate_ids: List[str] = None,
+                                   preferred_days: List[str] = None) -> Dict[str, Dict[int, int]]:
+        """
+        Count common available slots of one user against others inside Postgres
+
+        Self-joins the availability table on (day_of_week, time_slot_start)
+        for available rows (or ANDs the day masks in compact storage) and
+        groups by candidate and day, so no availability rows are shipped.
+        See SQL_scripts/availability_indexes.sql for the supporting indexes.
+
+        Returns {candidate_id: {day_of_week: common_slots}}; pairs with no
+        common slot are absent.
+        """
+        if preferred_days is None:
+            preferred_days = self.days
+
+        day_numbers = sorted({self.day_numbers[day] for day in preferred_days})
+        params = {'usn': user_id, 'days': day_numbers}
+
+        candidate_filter = ""
+        if candidate_ids:
+            candidate_filter = "AND b.usn = ANY(:candidate_ids)"
+            params['candidate_ids'] = list(candidate_ids)
+
+        if self.availability_storage == 'compact':
+            query = f"""
+            SELECT
+                b.usn AS candidate_id,
+                a.day_of_week,
+                LENGTH(REPLACE((a.slot_mask & b.slot_mask)::INTEGER::BIT(12)::TEXT, '0', '')) AS common_slots
+            FROM sample_user_availability_mask a
+            JOIN sample_user_availability_mask b
+                ON b.day_of_week = a.day_of_week
+                AND b.usn <> a.usn
+            WHERE a.usn = :usn
+                AND a.day_of_week = ANY(:days)
+                AND (a.slot_mask & b.slot_mask) <> 0
+                {candidate_filter}
+            """
+        else:
+            query = f"""
+            SELECT
+                b.usn AS candidate_id,
+                a.day_of_week,
+                COUNT(*) AS common_slots
+            FROM sample_user_availability a
+            JOIN sample_user_availability b
+                ON b.day_of_week = a.day_of_week
+                AND b.time_slot_start = a.time_slot_start
+                AND b.is_available
+                AND b.usn <> a.usn
+            WHERE a.usn = :usn
+                AND a.is_available
+                AND a.day_of_week = ANY(:days)
+                {candidate_filter}
+            GROUP BY b.usn, a.day_of_week
+            """
+
+        day_counts = defaultdict(dict)
+        for candidate_id, day_num, count in self._execute_scoring_query(query, params):
+            day_counts[candidate_id][day_num] = int(count)
+        return dict(day_counts)
+
+    def _execute_scoring_query(self, query: str, params: Dict) -> List[Tuple]:
+        """Run a :name-parameterized query on the psycopg2 or SQLAlchemy connection"""
+        if self.db_config['type'] == 'sqlalchemy':
+            with self.db_connection.connect() as conn:
+                rows = [tuple(row) for row in conn.execute(self._sql_statement(query), params)]
+        else:
+            # :name -> %(name)s, leaving ::casts alone
+            pg_query = re.sub(r'(?<!:):(\w+)', r'%(\1)s', query)
+            with self._pg_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(pg_query, params)
+                    rows = cursor.fetchall()
+
+        self._count_query()
+        return rows
+
+    def _build_recommendation(self, candidate_id: str, candidate_data: Dict, match_result: Dict) -> Dict:
+        """Shape one recommendation entry for the API"""
+        return {
+            'user_id': candidate_id,
+            'name': candidate_data['name'],
+            'first_name': candidate_data['first_name'],
+            'last_name': candidate_data['last_name'],
+            'department': candidate_data['department'],
+            'year': candidate_data['year'],
+            'skills': [dict(skill) for skill in candidate_data['skills']],
+            'schedule_match': match_result,
+            'recommendation_priority': match_result['recommendation_score']
+        }
+
+    def score_rows_against_cohort(self, row_bits: np.ndarray, cohort_bits: np.ndarray,
+                                  preferred_days: List[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized score_schedule_match for a block of users against a cohort
+
+        Args:
+        - row_bits: B x (12 * days) matrix from build_availability_matrix
+        - cohort_bits: N x (12 * days) matrix built with the same preferred_days
+
+        Returns (match_percentage, recommendation_score), both B x N. Match
+        percentages are rounded like score_schedule_match; scores are computed
+        with the same float operations, so they compare equal.
+        """
+        if preferred_days is None:
+            preferred_days = self.days
+
+        total_possible_slots = self.slots_per_day * len(preferred_days)
+        shape = (len(row_bits), len(cohort_bits))
+        if total_possible_slots == 0:
+            return np.zeros(shape), np.zeros(shape)
+
+        # Common slots per preferred day: one small matrix product per day
+        rows = row_bits.astype(np.float32)
+        cohort = cohort_bits.astype(np.float32)
+        day_common = []
+        for day_idx in range(len(preferred_days)):
+            columns = slice(day_idx * self.slots_per_day, (day_idx + 1) * self.slots_per_day)
+            day_common.append((rows[:, columns] @ cohort[:, columns].T).astype(np.int64))
+
+        common_slots = sum(day_common)
+        match_percentage = common_slots / total_possible_slots * 100
+
+        # Meeting potential averages the distinct days, mirroring _calculate_meeting_potential
+        first_position = {}
+        for day_idx, day in enumerate(preferred_days):
+            first_position.setdefault(day, day_idx)
+
+        total_score = np.zeros(shape)
+        for day_idx in first_position.values():
+            day_score = day_common[day_idx] / self.slots_per_day * 100
+            day_score = np.where(day_common[day_idx] >= 3, day_score * 1.2, day_score)
+            total_score = total_score + day_score
+        meeting_potential = total_score / len(first_position)
+
+        recommendation_score = self._calculate_recommendation_score(match_percentage, meeting_potential)
+
+        percentages = np.array([
+            round(count / total_possible_slots * 100, 1) for count in range(total_possible_slots + 1)
+        ])
+        return percentages[common_slots], recommendation_score
+
+    def build_skill_matrix(self, profiles: List[Dict]) -> Tuple['csr_matrix', Dict]:
+        """
+        Sparse proficiency vectors: one CSR row per profile, one column per skill_id
+
+        Returns (matrix, {skill_id: column}). Skills without an id (not yet
+        saved) are keyed by name.
+        """
+        from scipy.sparse import csr_matrix
+
+        columns = {}
+        data, indices, indptr = [], [], [0]
+        for profile in profiles:
+            for skill in profile.get('skills') or []:
+                key = skill.get('skill_id')
+                if key is None:
+                    key = skill.get('skill_name')
+                indices.append(columns.setdefault(key, len(columns)))
+                data.append(float(skill.get('proficiency_level') or 0))
+            indptr.append(len(indices))
+
+        matrix = csr_matrix((data, indices, indptr), shape=(len(profiles), max(1, len(columns))))
+        matrix.sum_duplicates()
+        return matrix, columns
+
+    def score_skills_against_candidates(self, user_profile: Dict, candidate_profiles: List[Dict],
+                                        skill_mode: str = None) -> np.ndarray:
+        """
+        Skill score (0-100) of one user against every candidate
+
+        - 'similarity': cosine similarity of the proficiency vectors
+        - 'complementarity': share of the candidate's proficiency in skills the user lacks
+
+        Each mode is a single sparse matrix-vector product over the candidates.
+        """
+        matrix, _ = self.build_skill_matrix([user_profile] + list(candidate_profiles))
+        user = matrix[0].toarray().ravel()
+        candidates = matrix[1:]
+        scores = np.zeros(candidates.shape[0])
+
+        if (skill_mode or self.skill_mode) == 'complementarity':
+            totals = np.asarray(candidates.sum(axis=1)).ravel()
+            gained = candidates @ (user == 0).astype(np.float64)
+            np.divide(gained, totals, out=scores, where=totals > 0)
+        else:
+            norms = np.sqrt(np.asarray(candidates.multiply(candidates).sum(axis=1)).ravel())
+            norms *= np.linalg.norm(user)
+            np.divide(candidates @ user, norms, out=scores, where=norms > 0)
+
+        return scores * 100
+
+    def _skill_scores(self, user_profile: Dict, candidate_profiles: List[Dict]) -> Optional[np.ndarray]:
+        """Skill scores when skill_weight is set (None means schedule-only scoring)"""
+        if not self.skill_weight or not candidate_profiles:
+            return None
+        try:
+            return self.score_skills_against_candidates(user_profile, candidate_profiles)
+        except ImportError:
+            print("SciPy not installed, scoring schedules only. Install with: pip install scipy")
+            return None
+
+    def build_recommendation_index(self, user_ids: List[str] = None, k: int = 10,
+                                   min_match_threshold: float = 20.0) -> 'RecommendationIndex':
+        """
+        Build the persistent top-k recommendation index and attach it to the matcher
+
+        Once built, api_get_profile_recommendations serves requests without
+        candidate_ids from the index instead of scanning the cohort. Build it
+        after wait_for_change_listener() so no change between the load and
+        LISTEN is lost; nothing else keeps it current.
+        """
+        index = RecommendationIndex(self, k=k, min_match_threshold=min_match_threshold,
+                                    max_age_seconds=self.index_max_age_seconds)
+        index.build(user_ids)
+        self.recommendation_index = index
+        return index
+
+    def batch_profile_recommendations(self, user_ids: List[str] = None,
+                                      preferred_days: List[str] = None,
+                                      min_match_threshold: float = 20.0,
+                                      limit: Optional[int] = 10,
+                                      workers: Optional[int] = None,
+                                      block_size: int = 256,
+                                      users_data: Dict = None) -> Dict[str, List[Dict]]:
+        """
+        Ranked recommendations for every user of a cohort (e.g. nightly team suggestions)
+
+        Same lists as calling get_profile_recommendations(user, cohort) for each
+        user, from one load. The packed masks are written once to shared
+        memory; a ProcessPoolExecutor of `workers` processes (default: CPU
+        count) attaches to it, and each task ranks a block of block_size users
+        against the whole cohort with score_rows_against_cohort.
+
+        Returns {user_id: recommendations}. Ranking is schedule-only
+        (skill_weight is not applied).
+        """
+        if preferred_days is None:
+            preferred_days = self.days
+
+        if users_data is None:
+            users_data = self.load_user_profiles(user_ids)
+
+        cohort_ids = [uid for uid in dict.fromkeys(user_ids or users_data) if uid in users_data]
+        packed = self._pack_masks([users_data[uid]['schedule']['available'] for uid in cohort_ids])
+        blocks = [(start, min(start + block_size, len(cohort_ids)))
+                  for start in range(0, len(cohort_ids), block_size)]
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        if workers <= 1 or len(blocks) <= 1:
+            bits = self._unpack_mask_matrix(packed, preferred_days)
+            ranked_blocks = [
+                _rank_cohort_rows(self, bits, start, stop, preferred_days, min_match_threshold, limit)
+                for start, stop in blocks
+            ]
+        else:
+            from multiprocessing import shared_memory
+
+            shm = shared_memory.SharedMemory(create=True, size=max(1, packed.nbytes))
+            try:
+                shared = np.ndarray(packed.shape, dtype=np.uint8, buffer=shm.buf)
+                shared[:] = packed
+                del shared
+
+                with ProcessPoolExecutor(max_workers=min(workers, len(blocks)),
+                                         initializer=_init_batch_worker,
+                                         initargs=(shm.name, packed.shape, preferred_days)) as pool:
+                    ranked_blocks = list(pool.map(
+                        _rank_batch_block, blocks,
+                        itertools.repeat(min_match_threshold), itertools.repeat(limit)
+                    ))
+            finally:
+                shm.close()
+                shm.unlink()
+
+        results = {}
+        for (start, _), ranked_rows in zip(blocks, ranked_blocks):
+            for offset, ranked in enumerate(ranked_rows):
+                user_id = cohort_ids[start + offset]
+                user_profile = users_data[user_id]
+                results[user_id] = [
+                    self._build_recommendation(
+                        cohort_ids[position], users_data[cohort_ids[position]],
+                        self.score_schedule_match(user_profile, users_data[cohort_ids[position]], preferred_days)
+                    )
+                    for position in ranked
+                ]
+
+        return results
+
+    def form_teams(self, user_ids: List[str] = None, team_size: int = 4,
+                   preferred_days: List[str] = None, time_budget_seconds: float = 2.0,
+                   time_weight: float = 1.0, skill_weight: float = 1.0,
+                   users_data: Dict = None) -> Dict:
+        """
+        Partition a cohort into teams of team_size (see TeamFormationEngine)
+
+        Maximizes common meeting slots plus skill complementarity within
+        time_budget_seconds.
+        """
+        engine = TeamFormationEngine(self, team_size=team_size, preferred_days=preferred_days,
+                                     time_weight=time_weight, skill_weight=skill_weight)
+        return engine.form_teams(user_ids, time_budget_seconds, users_data)
+
+    def calculate_match_matrix(self, users_data: Dict,
+                               preferred_days: List[str] = None) -> Tuple[List[str], np.ndarray]:
+        """
+        Calculate all-pairs schedule match percentages for a loaded cohort
+
+        Args:
+        - users_data: Profiles as returned by load_user_profiles()
+        - preferred_days: Days to consider for matching
+
+        Returns (user_ids, matrix) where matrix[i, j] equals the
+        match_percentage of calculate_schedule_match_percentage(user_ids[i], user_ids[j]).
+        Common slot counts come from a single matrix product over the
+        N x 84 availability matrix.
+        """
+        if preferred_days is None:
+            preferred_days = self.days
+
+        user_ids = list(users_data.keys())
+        total_possible_slots = self.slots_per_day * len(preferred_days)
+
+        if total_possible_slots == 0:
+            return user_ids, np.zeros((len(user_ids), len(user_ids)))
+
+        availability = self.build_availability_matrix(
+            [users_data[uid]['schedule']['available'] for uid in user_ids], preferred_days
+        ).astype(np.float32)
+        common_slots = (availability @ availability.T).astype(np.int64)
+
+        # Percentages via a lookup over every possible count so rounding matches round(..., 1)
+        percentages = np.array([
+            round(count / total_possible_slots * 100, 1) for count in range(total_possible_slots + 1)
+        ])
+        return user_ids, percentages[common_slots]
+
+    def find_team_meeting_slots(self, team_member_ids: List[str],
+                               preferred_days: List[str] = None,
+                               min_duration_hours: int = 2,
+                               users_data: Dict = None) -> Dict:
+        """
+        Find available meeting slots for a formed team
+
+        Args:
+        - team_member_ids: List of team member IDs
+        - preferred_days: Days to check for meetings
+        - min_duration_hours: Minimum meeting duration
+        - users_data: Already-loaded profiles (skips the database load)
+
+        Returns:
+        - perfect_slots: 100% availability slots inside a window of at least min_duration_hours
+        - meeting_windows: Contiguous all-member windows of at least min_duration_hours
+        - good_slots: High availability slots (80%+), and 100% slots in runs shorter than min_duration_hours
+        - backup_slots: Partial availability slots
+        - statistics: Overall analysis
+        """
+
+        if len(team_member_ids) < 2:
+            return {'error': 'Need at least 2 team members'}
+
+        # Load team data
+        if users_data is None:
+            users_data = self.load_user_profiles(team_member_ids)
+
+        missing_users = [uid for uid in team_member_ids if uid not in users_data]
+        if missing_users:
+            return {'error': f'Users not found: {missing_users}'}
+
+        if preferred_days is None:
+            preferred_days = self.days
+
+        perfect_slots = []
+        good_slots = []
+        backup_slots = []
+        day_statistics = {}
+
+        member_masks = [users_data[uid]['schedule']['available'] for uid in team_member_ids]
+
+        # Slots where every member is free are the set bits of the ANDed masks
+        team_mask = member_masks[0]
+        for mask in member_masks[1:]:
+            team_mask &= mask
+
+        slot_length = self.slot_minutes[0][1] - self.slot_minutes[0][0]
+        slots_needed = max(1, math.ceil((min_duration_hours or 0) * 60 / slot_length))
+        meeting_windows, window_mask = self._find_meeting_windows(team_mask, preferred_days, slots_needed)
+
+        for day in preferred_days:
+            day_perfect = 0
+            day_good = 0
+            day_backup = 0
+            day_shift = self.day_numbers[day] * self.slots_per_day
+
+            # Check each standard time slot
+            for slot_idx, time_slot in enumerate(self.time_slots):
+                bit = 1 << (day_shift + slot_idx)
+
+                if team_mask & bit:
+                    available_members = list(team_member_ids)
+                else:
+                    available_members = [uid for uid, mask in zip(team_member_ids, member_masks)
+                                         if mask & bit]
+
+                availability_percentage = (len(available_members) / len(team_member_ids)) * 100
+
+                slot_info = {
+                    'day': day.capitalize(),
+                    'time_slot': self.time_slot_to_string(time_slot),
+                    'start_time': time_slot[0],
+                    'end_time': time_slot[1],
+                    'availability_percentage': round(availability_percentage, 1),
+                    'available_members': len(available_members),
+                    'total_members': len(team_member_ids),
+                    'available_member_names': [users_data[uid]['name'] for uid in available_members],
+                    'unavailable_member_names': [users_data[uid]['name']
+                                               for uid in team_member_ids if uid not in available_members]
+                }
+
+                # Only slots inside a long enough all-member window count as perfect meeting times;
+                # shorter all-member runs are still good slots
+                if availability_percentage == 100 and window_mask & bit:
+                    perfect_slots.append(slot_info)
+                    day_perfect += 1
+                elif availability_percentage >= 80:
+                    good_slots.append(slot_info)
+                    day_good += 1
+                elif availability_percentage >= 50:
+                    backup_slots.append(slot_info)
+                    day_backup += 1
+
+            day_statistics[day] = {
+                'perfect_slots': day_perfect,
+                'good_slots': day_good,
+                'backup_slots': day_backup,
+                'total_viable_slots': day_perfect + day_good + day_backup
+            }
+
+        # Calculate overall statistics
+        total_perfect = len(perfect_slots)
+        total_good = len(good_slots)
+        total_backup = len(backup_slots)
+        total_checked = len(preferred_days) * len(self.time_slots)
+
+        success_rate = ((total_perfect + total_good) / total_checked * 100) if total_checked > 0 else 0
+
+        return {
+            'team_info': {
+                'member_ids': team_member_ids,
+                'member_names': [users_data[uid]['name'] for uid in team_member_ids],
+                'team_size': len(team_member_ids)
+            },
+            'perfect_slots': perfect_slots[:10],  # Limit to top 10
+            'meeting_windows': sorted(meeting_windows, key=lambda w: w['duration_hours'], reverse=True)[:10],
+            'good_slots': good_slots[:10],
+            'backup_slots': backup_slots[:5],
+            'statistics': {
+                'total_meeting_windows': len(meeting_windows),
+                'longest_window_hours': max((w['duration_hours'] for w in meeting_windows), default=0),
+                'total_perfect_slots': total_perfect,
+                'total_good_slots': total_good,
+                'total_backup_slots': total_backup,
+                'success_rate': round(success_rate, 1),
+                'day_breakdown': day_statistics,
+                'recommendation': self._get_meeting_recommendation(total_perfect, total_good, total_backup)
+            }
+        }
+
+    def _find_meeting_windows(self, team_mask: int, preferred_days: List[str],
+                              slots_needed: int) -> Tuple[List[Dict], int]:
+        """
+        Sweep the team's combined mask for contiguous common availability
+
+        run_length[pos] is the number of consecutive common slots starting at
+        pos, following 22:00 -> 00:00 into the next day (and Saturday into
+        Sunday). It is filled in one backward pass; each preferred day is
+        then one linear pass over its 12 slots. A team free all week has one
+        run, reported once from the first preferred day.
+
+        Returns (windows starting on a preferred day, mask of every slot
+        inside any window of at least slots_needed).
+        """
+        week_slots = len(self.days) * self.slots_per_day
+        whole_week = team_mask == (1 << week_slots) - 1
+
+        run_length = [0] * (2 * week_slots + 1)
+        for pos in range(2 * week_slots - 1, -1, -1):
+            if team_mask >> (pos % week_slots) & 1:
+                run_length[pos] = run_length[pos + 1] + 1
+
+        week_start = self.day_numbers[preferred_days[0]] * self.slots_per_day if preferred_days else 0
+
+        def run_starts_at(pos):
+            previous = (pos - 1) % week_slots
+            if whole_week:
+                return pos == week_start
+            return run_length[pos] > 0 and not team_mask >> previous & 1
+
+        window_mask = 0
+        for pos in range(week_slots):
+            length = min(run_length[pos], week_slots)
+            if run_starts_at(pos) and length >= slots_needed:
+                for offset in range(length):
+                    window_mask |= 1 << ((pos + offset) % week_slots)
+
+        windows = []
+        for day in dict.fromkeys(preferred_days):
+            day_start = self.day_numbers[day] * self.slots_per_day
+            for pos in range(day_start, day_start + self.slots_per_day):
+                length = min(run_length[pos], week_slots)
+                if not run_starts_at(pos) or length < slots_needed:
+                    continue
+
+                end_pos = (pos + length - 1) % week_slots
+                start_slot = self.time_slots[pos % self.slots_per_day]
+                end_slot = self.time_slots[end_pos % self.slots_per_day]
+                # A window ending with the 22:00-00:00 slot ends at midnight of the next day
+                end_day = (end_pos // self.slots_per_day
+                           + self.slot_minutes[end_pos % self.slots_per_day][1] // (24 * 60)) % len(self.days)
+                windows.append({
+                    'day': day.capitalize(),
+                    'start_time': start_slot[0],
+                    'end_day': self.days[end_day].capitalize(),
+                    'end_time': end_slot[1],
+                    'duration_hours': length * (self.slot_minutes[0][1] - self.slot_minutes[0][0]) / 60,
+                    'slot_count': length
+                })
+
+        return windows, window_mask
+
+    # ===========================================
+    # SKILL SEARCH
+    # ===========================================
+
+    def load_skill_names(self) -> List[str]:
+        """Every name in the skills table, in insertion order"""
+        if self.db_config['type'] == 'supabase':
+            names = []
+
+            def skills_query(count=None):
+                return self.db_connection.table('skills').select('name', count=count).order('skill_id')
+
+            self._fetch_supabase_pages(
+                skills_query, 'skills', lambda rows: names.extend(row['name'] for row in rows)
+            )
+            return names
+
+        return [row[0] for row in self._execute_scoring_query("SELECT name FROM skills ORDER BY skill_id", {})]
+
+    def build_skill_index(self, max_results: int = 20) -> 'SkillSearchIndex':
+        """Build the in-process skill name index and attach it to the matcher"""
+        index = SkillSearchIndex(self.load_skill_names(), max_results=max_results)
+        self.skill_index = index
+        return index
+
+    def search_skills(self, query: str, limit: int = 10) -> List[str]:
+        """
+        Fuzzy skill lookup with pg_trgm (SQL_scripts/skill_search.sql)
+
+        Prefix and word matches rank first, then trigram similarity, so
+        misspellings ('pyhton') still find the skill. Use the in-process
+        SkillSearchIndex for plain prefix type-ahead; this costs a round trip.
+        """
+        query = ' '.join(query.split())
+        if not query:
+            return []
+
+        if self.db_config['type'] == 'supabase':
+            result = self.db_connection.rpc('search_skills', {'p_query': query, 'p_limit': limit}).execute()
+            self._count_query()
+            return [row['name'] for row in result.data]
+
+        return [row[1] for row in self._execute_scoring_query(
+            "SELECT skill_id, name FROM search_skills(:query, :limit)", {'query': query, 'limit': limit}
+        )]
+
+    # ===========================================
+    # UTILITY METHODS
+    # ===========================================
+
+    def _calculate_meeting_potential(self, day_breakdown: Dict) -> float:
+        """Calculate meeting potential score based on day distribution"""
+        total_score = 0
+        total_days = len(day_breakdown)
+
+        for day_data in day_breakdown.values():
+            # Weight recent days higher, prefer consistent availability
+            day_score = day_data['day_percentage']
+            if day_data['common_slots'] >= 3:  # Bonus for multiple slots per day
+                day_score *= 1.2
+            total_score += day_score
+
+        return total_score / total_days if total_days > 0 else 0
+
+    def _calculate_recommendation_score(self, match_percentage: float, meeting_potential: float,
+                                        skill_score: Optional[float] = None) -> float:
+        """Calculate overall recommendation score"""
+        # Weighted combination: 60% match percentage, 40% meeting potential
+        schedule_score = (match_percentage * 0.6) + (meeting_potential * 0.4)
+        if skill_score is None or not self.skill_weight:
+            return schedule_score
+
+        # Blend in the skill score (0-100) by skill_weight
+        return schedule_score * (1 - self.skill_weight) + skill_score * self.skill_weight
+
+    def _get_meeting_recommendation(self, perfect: int, good: int, backup: int) -> str:
+        """Generate meeting recommendation based on available slots"""
+        if perfect >= 5:
+            return "Excellent - Multiple perfect meeting times available"
+        elif perfect >= 2:
+            return "Good - Several perfect meeting times available"
+        elif perfect >= 1 or good >= 3:
+            return "Fair - Some good meeting opportunities"
+        elif good >= 1 or backup >= 3:
+            return "Challenging - Limited meeting opportunities"
+        else:
+            return "Difficult - Very few meeting opportunities"
+
+    # ===========================================
+    # WEB API READY METHODS
+    # ===========================================
+
+    def api_get_profile_recommendations(self, user_id: str, params: Dict) -> Dict:
+        """
+        API endpoint for getting profile recommendations
+
+        Expected params:
+        - candidate_ids: List[str] (omit to use the recommendation index, if built)
+        - preferred_days: Optional[List[str]]
+        - min_match_threshold: Optional[float]
+        - limit: Optional[int]
+        - scoring_mode: Optional[str] ('python' or 'sql')
+        """
+        try:
+            queries_before = self.get_thread_query_count()
+            candidate_ids = params.get('candidate_ids', [])
+            preferred_days = params.get('preferred_days', self.days)
+            min_threshold = params.get('min_match_threshold', 20.0)
+            limit = params.get('limit', 10)
+
+            index = self.recommendation_index
+            if not candidate_ids and index is not None and index.can_serve(preferred_days, min_threshold, limit):
+                # O(k) lookup in the precomputed top-k index
+                recommendations = index.get_recommendations(user_id, limit)
+                return {
+                    'success': True,
+                    'data': recommendations,
+                    'total_candidates': index.size(),
+                    'returned_recommendations': len(recommendations),
+                    'queries_issued': self.get_thread_query_count() - queries_before
+                }
+
+            recommendations = self.get_profile_recommendations(
+                user_id, candidate_ids, preferred_days, min_threshold, limit,
+                params.get('scoring_mode')
+            )
+
+            return {
+                'success': True,
+                'data': recommendations[:limit],
+                'total_candidates': len(candidate_ids),
+                'returned_recommendations': len(recommendations[:limit]),
+                'queries_issued': self.get_thread_query_count() - queries_before
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+
+    def api_get_team_meeting_slots(self, params: Dict) -> Dict:
+        """
+        API endpoint for getting team meeting slots
+
+        Expected params:
+        - team_member_ids: List[str]
+        - preferred_days: Optional[List[str]]
+        - min_duration_hours: Optional[int]
+        """
+        try:
+            queries_before = self.get_thread_query_count()
+            team_ids = params.get('team_member_ids', [])
+            preferred_days = params.get('preferred_days', self.days)
+            min_duration = params.get('min_duration_hours', 2)
+
+            result = self.find_team_meeting_slots(team_ids, preferred_days, min_duration)
+
+            queries_issued = self.get_thread_query_count() - queries_before
+
+            if 'error' in result:
+                return {
+                    'success': False,
+                    'error': result['error'],
+                    'queries_issued': queries_issued
+                }
+
+            return {
+                'success': True,
+                'data': result,
+                'queries_issued': queries_issued
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+
+# ===========================================
+# RECOMMENDATION INDEX
+# ===========================================
+
+class RecommendationIndex:
+    """
+    Persistent per-user top-k neighbour index over the whole cohort
+
+    Each row is a min-heap of the k best (recommendation_score, candidate_id)
+    pairs over all days. update_user() re-scores one changed student against
+    everyone with a single vectorized pass and only recomputes the rows that
+    student drops out of; other rows are patched with a heap push/replace.
+    """
+
+    def __init__(self, matcher: WebScheduleMatcher, k: int = 10, min_match_threshold: float = 20.0,
+                 max_age_seconds: Optional[float] = None):
+        self.matcher = matcher
+        self.k = k
+        self.min_match_threshold = min_match_threshold
+        self.max_age_seconds = max_age_seconds
+        self.built_at = None
+
+        self.profiles = {}
+        self.user_ids = []
+        self.positions = {}
+        self.availability = np.zeros((0, len(matcher.days) * matcher.slots_per_day), dtype=np.uint8)
+        self.neighbours = {}
+
+        # The user_ids the index was built for (None = whole cohort), for rebuilds;
+        # a stale index is not served until it is rebuilt
+        self.source_ids = None
+        self.stale = False
+
+        self._lock = threading.Lock()
+
+    def build(self, user_ids: List[str] = None, block_size: int = 256, profiles: Dict = None):
+        """Load the cohort (unless profiles are given) and compute every row with block matrix products"""
+        if profiles is None:
+            profiles = self.matcher.load_user_profiles(user_ids)
+
+        with self._lock:
+            self.source_ids = user_ids
+            self.profiles = profiles
+            self.user_ids = list(profiles.keys())
+            self.positions = {uid: pos for pos, uid in enumerate(self.user_ids)}
+            self.availability = self.matcher.build_availability_matrix(
+                [profiles[uid]['schedule']['available'] for uid in self.user_ids]
+            )
+            self.neighbours = {}
+
+            for start in range(0, len(self.user_ids), block_size):
+                block = self.availability[start:start + block_size]
+                match_percentage, scores = self.matcher.score_rows_against_cohort(block, self.availability)
+                for offset in range(len(block)):
+                    self.neighbours[self.user_ids[start + offset]] = self._select_top_k(
+                        start + offset, match_percentage[offset], scores[offset]
+                    )
+            self.stale = False
+            self.built_at = time_module.monotonic()
+
+        return self
+
+    def size(self) -> int:
+        """Number of indexed users"""
+        return len(self.user_ids)
+
+    def expired(self) -> bool:
+        """Whether the index is older than max_age_seconds"""
+        return (self.max_age_seconds is not None and self.built_at is not None
+                and time_module.monotonic() - self.built_at >= self.max_age_seconds)
+
+    def can_serve(self, preferred_days: List[str], min_match_threshold: float, limit: int) -> bool:
+        """Whether the index is current and a request's parameters match what it was built with"""
+        return (not self.stale
+                and not self.expired()
+                and list(preferred_days or self.matcher.days) == self.matcher.days
+                and min_match_threshold == self.min_match_threshold
+                and limit <= self.k
+                and not self.matcher.skill_weight)
+
+    def get_recommendations(self, user_id: str, limit: int = None) -> List[Dict]:
+        """Top recommendations for a user, shaped like get_profile_recommendations"""
+        with self._lock:
+            if user_id not in self.neighbours:
+                return [{'error': 'User not found'}]
+
+            top = sorted(self.neighbours[user_id], reverse=True)[:limit]
+            user_profile = self.profiles[user_id]
+
+            return [
+                self.matcher._build_recommendation(
+                    candidate_id, self.profiles[candidate_id],
+                    self.matcher.score_schedule_match(user_profile, self.profiles[candidate_id])
+                )
+                for _, candidate_id in top
+            ]
+
+    def update_user(self, user_id: str, profiles: Dict = None):
+        """
+        Refresh one student after they submit or change availability
+
+        Reloads just that profile (unless freshly loaded profiles are given;
+        a user_id missing from them is treated as deleted), recomputes its
+        own row and fixes up the rows it enters, moves within or leaves.
+        """
+        if profiles is None:
+            self.matcher.invalidate_cache([user_id])
+            profiles = self.matcher.load_user_profiles([user_id])
+
+        with self._lock:
+            if user_id not in profiles:
+                self._remove_user(user_id)
+                return
+
+            profile = profiles[user_id]
+            bits = self.matcher.build_availability_matrix([profile['schedule']['available']])
+
+            if user_id in self.positions:
+                self.availability[self.positions[user_id]] = bits[0]
+            else:
+                self.positions[user_id] = len(self.user_ids)
+                self.user_ids.append(user_id)
+                self.availability = np.vstack([self.availability, bits])
+            self.profiles[user_id] = profile
+
+            position = self.positions[user_id]
+            match_percentage, scores = self.matcher.score_rows_against_cohort(bits, self.availability)
+            match_percentage, scores = match_percentage[0], scores[0]
+            self.neighbours[user_id] = self._select_top_k(position, match_percentage, scores)
+
+            # Scores are symmetric, so the new row is also the changed column of every other row
+            for other_position, other_id in enumerate(self.user_ids):
+                if other_id == user_id:
+                    continue
+
+                qualifies = match_percentage[other_position] >= self.min_match_threshold
+                self._update_row(other_id, user_id, float(scores[other_position]), qualifies)
+
+    def _update_row(self, row_id: str, candidate_id: str, score: float, qualifies: bool):
+        """Apply one changed (row, candidate) score to a row's heap"""
+        heap = self.neighbours[row_id]
+        entry = (score, candidate_id)
+        old_entry = next((existing for existing in heap if existing[1] == candidate_id), None)
+        row_full = len(heap) == self.k
+
+        if old_entry is None:
+            if not qualifies:
+                return
+            if not row_full:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+            return
+
+        # A full row that loses ground may now be beaten by a candidate outside it
+        if row_full and (not qualifies or entry < heap[0]):
+            self.neighbours[row_id] = self._recompute_row(row_id)
+            return
+
+        heap.remove(old_entry)
+        if qualifies:
+            heap.append(entry)
+        heapq.heapify(heap)
+
+    def _remove_user(self, user_id: str):
+        """Drop a user who no longer exists and repair rows that pointed at them"""
+        if user_id not in self.positions:
+            return
+
+        keep = [pos for pos, uid in enumerate(self.user_ids) if uid != user_id]
+        self.availability = self.availability[keep]
+        self.user_ids = [self.user_ids[pos] for pos in keep]
+        self.positions = {uid: pos for pos, uid in enumerate(self.user_ids)}
+        self.profiles.pop(user_id, None)
+        self.neighbours.pop(user_id, None)
+
+        for row_id, heap in self.neighbours.items():
+            if any(entry[1] == user_id for entry in heap):
+                self.neighbours[row_id] = self._recompute_row(row_id)
+
+    def _recompute_row(self, row_id: str) -> List[Tuple[float, str]]:
+        """Re-score one row against the whole cohort"""
+        position = self.positions[row_id]
+        match_percentage, scores = self.matcher.score_rows_against_cohort(
+            self.availability[position:position + 1], self.availability
+        )
+        return self._select_top_k(position, match_percentage[0], scores[0])
+
+    def _select_top_k(self, position: int, match_percentage: np.ndarray,
+                      scores: np.ndarray) -> List[Tuple[float, str]]:
+        """Heap-based partial selection of the k best qualifying candidates for one row"""
+        qualifying = np.flatnonzero(match_percentage >= self.min_match_threshold)
+        candidates = ((float(scores[pos]), self.user_ids[pos]) for pos in qualifying if pos != position)
+
+        heap = heapq.nlargest(self.k, candidates)
+        heapq.heapify(heap)
+        return heap
+
+# ===========================================
+# TEAM FORMATION
+# ===========================================
+
+class TeamFormationEngine:
+    """
+    Partition a cohort into teams of team_size students
+
+    When the cohort does not divide evenly, leftovers join different teams
+    (at most team_size + 1 members each) or, if there are at least
+    max(2, ceil(team_size / 2)) of them, form one smaller team of their own.
+
+    A team scores time_weight * (slots every member is available, over the
+    preferred days) + skill_weight * (sum over skills of the best member's
+    proficiency, divided by 5). Greedy seeding starts each team from the
+    hardest-to-place student and adds the best of a random candidate sample;
+    swap-based local search then exchanges members of two teams until a full
+    pass over every pair of teams finds no improving swap.
+
+    Availability and skills are int bitsets (the skill bitset holds one
+    block of bits per proficiency threshold, so OR-ing members and counting
+    bits gives the summed best proficiencies), and each team caches the
+    AND/OR of its members with one member left out, so a swap is scored from
+    the two affected teams with four bit operations and four popcounts.
+    The time budget caps the local search; greedy seeding always completes.
+    """
+
+    LEVELS = 5
+
+    def __init__(self, matcher: WebScheduleMatcher, team_size: int = 4,
+                 preferred_days: List[str] = None, time_weight: float = 1.0,
+                 skill_weight: float = 1.0, sample_size: int = 64, seed: int = 0):
+        self.matcher = matcher
+        self.team_size = team_size
+        self.preferred_days = preferred_days or matcher.days
+        self.time_weight = time_weight
+        self.skill_weight = skill_weight
+        self.sample_size = sample_size
+        self.seed = seed
+
+        self.days_mask = 0
+        for day in self.preferred_days:
+            self.days_mask |= matcher.day_mask << (matcher.day_numbers[day] * matcher.slots_per_day)
+
+    def form_teams(self, user_ids: List[str] = None, time_budget_seconds: float = 2.0,
+                   users_data: Dict = None) -> Dict:
+        """
+        Form teams for user_ids (or every loaded profile)
+
+        Returns:
+        - teams: [{'members', 'common_slots', 'skill_score', 'score'}], best first
+        - statistics: initial/final total score, swaps tried/accepted, elapsed time
+        """
+        started = time_module.monotonic()
+        deadline = started + time_budget_seconds
+
+        if users_data is None:
+            users_data = self.matcher.load_user_profiles(user_ids)
+
+        member_ids = [uid for uid in dict.fromkeys(user_ids or users_data) if uid in users_data]
+        if len(member_ids) < 2 or self.team_size < 2:
+            return {'error': 'Need at least 2 students and a team size of at least 2'}
+
+        self._prepare(member_ids, users_data)
+        rng = random.Random(self.seed)
+
+        teams = self._greedy_teams(rng)
+        caches = [self._team_cache(team) for team in teams]
+        initial_score = sum(cache[0] for cache in caches)
+
+        tried, accepted = self._local_search(teams, caches, rng, deadline)
+
+        results = []
+        for team, cache in zip(teams, caches):
+            common_slots, skill_score = self._team_parts(team)
+            results.append({
+                'members': [member_ids[idx] for idx in team],
+                'common_slots': common_slots,
+                'skill_score': round(skill_score, 2),
+                'score': round(cache[0], 2)
+            })
+        results.sort(key=lambda team: team['score'], reverse=True)
+
+        return {
+            'teams': results,
+            'statistics': {
+                'students': len(member_ids),
+                'teams': len(teams),
+                'team_size': self.team_size,
+                'initial_score': round(initial_score, 2),
+                'final_score': round(sum(cache[0] for cache in caches), 2),
+                'swaps_tried': tried,
+                'swaps_accepted': accepted,
+                'elapsed_seconds': round(time_module.monotonic() - started, 3)
+            }
+        }
+
+    def _prepare(self, member_ids: List[str], users_data: Dict):
+        """Bitsets per student: availability on the preferred days, and skills per proficiency threshold"""
+        skill_positions = {}
+        levels_per_student = []
+        self.availability = []
+
+        for uid in member_ids:
+            profile = users_data[uid]
+            self.availability.append(profile['schedule']['available'] & self.days_mask)
+
+            levels = [0] * self.LEVELS
+            for skill in profile.get('skills') or []:
+                bit = 1 << skill_positions.setdefault(skill['skill_name'], len(skill_positions))
+                for level in range(min(int(skill.get('proficiency_level') or 0), self.LEVELS)):
+                    levels[level] |= bit
+            levels_per_student.append(levels)
+
+        # Threshold t lives in bits [t * skill_count, (t + 1) * skill_count)
+        skill_count = len(skill_positions)
+        self.skills = [
+            sum(mask << (level * skill_count) for level, mask in enumerate(levels))
+            for levels in levels_per_student
+        ]
+
+    def _score(self, availability: int, skills: int) -> float:
+        """Team score from the AND of its availability and the OR of its skill bitsets"""
+        popcount = self.matcher._popcount
+        return self.time_weight * popcount(availability) + self.skill_weight * popcount(skills) / self.LEVELS
+
+    def _team_masks(self, team: List[int]) -> Tuple[int, int]:
+        """(availability AND, skills OR) over a team's members"""
+        availability, skills = self.days_mask, 0
+        for idx in team:
+            availability &= self.availability[idx]
+            skills |= self.skills[idx]
+        return availability, skills
+
+    def _team_parts(self, team: List[int]) -> Tuple[int, float]:
+        """(common_slots, skill_score) of a team"""
+        availability, skills = self._team_masks(team)
+        return self.matcher._popcount(availability), self.matcher._popcount(skills) / self.LEVELS
+
+    def _team_cache(self, team: List[int]) -> Tuple[float, List[int], List[int]]:
+        """(score, availability AND without member i, skills OR without member i) via prefix/suffix passes"""
+        size = len(team)
+        prefix_and = [self.days_mask] * (size + 1)
+        prefix_or = [0] * (size + 1)
+        for pos, idx in enumerate(team):
+            prefix_and[pos + 1] = prefix_and[pos] & self.availability[idx]
+            prefix_or[pos + 1] = prefix_or[pos] | self.skills[idx]
+
+        suffix_and, suffix_or = self.days_mask, 0
+        without_and = [0] * size
+        without_or = [0] * size
+        for pos in range(size - 1, -1, -1):
+            without_and[pos] = prefix_and[pos] & suffix_and
+            without_or[pos] = prefix_or[pos] | suffix_or
+            suffix_and &= self.availability[team[pos]]
+            suffix_or |= self.skills[team[pos]]
+
+        return self._score(prefix_and[size], prefix_or[size]), without_and, without_or
+
+    def _score_with(self, cache, pos: int, idx: int) -> float:
+        """Score of a cached team after replacing the member at pos with student idx"""
+        return self._score(cache[1][pos] & self.availability[idx], cache[2][pos] | self.skills[idx])
+
+    def _greedy_teams(self, rng: random.Random) -> List[List[int]]:
+        """Seed each team with the least available student, then add the best sampled candidate"""
+        student_count = len(self.availability)
+        team_count, leftover_count = divmod(student_count, self.team_size)
+        # Enough leftovers for a team of at least 2 make their own smaller team instead of
+        # overfilling the others; so do more leftovers than there are teams to take them
+        if (team_count == 0 or leftover_count >= max(2, math.ceil(self.team_size / 2))
+                or leftover_count > team_count):
+            team_count += 1
+        popcount = self.matcher._popcount
+
+        by_availability = sorted(range(student_count), key=lambda idx: popcount(self.availability[idx]))
+        remaining = list(by_availability)
+        position = {idx: pos for pos, idx in enumerate(remaining)}
+
+        def take(idx):
+            pos = position.pop(idx)
+            last = remaining.pop()
+            if last != idx:
+                remaining[pos] = last
+                position[last] = pos
+
+        def best_candidate(team):
+            availability, skills = self._team_masks(team)
+            sample = remaining if len(remaining) <= self.sample_size else rng.sample(remaining, self.sample_size)
+            return max(sample, key=lambda idx: self._score(availability & self.availability[idx],
+                                                           skills | self.skills[idx]))
+
+        teams = []
+        pointer = 0
+        for _ in range(team_count):
+            while by_availability[pointer] not in position:
+                pointer += 1
+            team = [by_availability[pointer]]
+            take(team[0])
+            while len(team) < self.team_size and remaining:
+                candidate = best_candidate(team)
+                take(candidate)
+                team.append(candidate)
+            teams.append(team)
+
+        # Remaining leftovers each join a different full-size team (capped at team_size + 1), where they cost least
+        for idx in list(remaining):
+            open_teams = [t for t in range(len(teams)) if len(teams[t]) == self.team_size]
+            best = max(open_teams, key=lambda t: self._team_cache(teams[t] + [idx])[0]
+                       - self._team_cache(teams[t])[0])
+            teams[best].append(idx)
+
+        return teams
+
+    def _local_search(self, teams: List[List[int]], caches: List, rng: random.Random,
+                      deadline: float) -> Tuple[int, int]:
+        """
+        Member swaps between two teams, kept when they raise the total score
+
+        Each pass tries every member swap of every pair of teams, in rounds
+        that pair each team with the one `shift` places later in a shuffled
+        order, so a deadline cuts a pass evenly across teams. The search
+        stops after a pass with no improvement (a local optimum) or at the
+        deadline, checked every 256 swaps.
+        """
+        tried = accepted = 0
+        team_count = len(teams)
+        order = list(range(team_count))
+        improved = team_count > 1
+        while improved:
+            improved = False
+            rng.shuffle(order)
+            for shift in range(1, team_count // 2 + 1):
+                # With an even count the last round would visit each pair twice
+                for offset in range(team_count if 2 * shift < team_count else team_count // 2):
+                    first, second = order[offset], order[(offset + shift) % team_count]
+                    for first_pos in range(len(teams[first])):
+                        for second_pos in range(len(teams[second])):
+                            if tried % 256 == 0 and time_module.monotonic() >= deadline:
+                                return tried, accepted
+                            tried += 1
+
+                            if self._try_swap(teams, caches, first, first_pos, second, second_pos):
+                                accepted += 1
+                                improved = True
+
+        return tried, accepted
+
+    def _try_swap(self, teams: List[List[int]], caches: List, first: int, first_pos: int,
+                  second: int, second_pos: int) -> bool:
+        """Swap two members if that raises the two teams' combined score"""
+        first_idx = teams[first][first_pos]
+        second_idx = teams[second][second_pos]
+
+        delta = (self._score_with(caches[first], first_pos, second_idx)
+                 + self._score_with(caches[second], second_pos, first_idx)
+                 - caches[first][0] - caches[second][0])
+        if delta <= 1e-9:
+            return False
+
+        teams[first][first_pos] = second_idx
+        teams[second][second_pos] = first_idx
+        caches[first] = self._team_cache(teams[first])
+        caches[second] = self._team_cache(teams[second])
+        return True
+
+# ===========================================
+# BATCH RECOMMENDATION WORKERS
+# ===========================================
+
+# Per-process state set up once by _init_batch_worker
+_batch_worker_state = {}
+
+def _init_batch_worker(shm_name: str, shape: Tuple[int, int], preferred_days: List[str]):
+    """ProcessPoolExecutor initializer: attach to the shared packed masks and unpack them once"""
+    from multiprocessing import shared_memory
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    matcher = WebScheduleMatcher()
+    packed = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+    _batch_worker_state.update(
+        shm=shm,
+        matcher=matcher,
+        preferred_days=preferred_days,
+        bits=matcher._unpack_mask_matrix(packed, preferred_days)
+    )
+
+def _rank_batch_block(block: Tuple[int, int], min_match_threshold: float, limit: Optional[int]) -> List[List[int]]:
+    """Worker task: rank one block of cohort rows"""
+    state = _batch_worker_state
+    return _rank_cohort_rows(state['matcher'], state['bits'], block[0], block[1],
+                             state['preferred_days'], min_match_threshold, limit)
+
+def _rank_cohort_rows(matcher: WebScheduleMatcher, bits: np.ndarray, start: int, stop: int,
+                      preferred_days: List[str], min_match_threshold: float,
+                      limit: Optional[int]) -> List[List[int]]:
+    """
+    Cohort positions of each row's best candidates, best first
+
+    Ties keep cohort order, as heapq.nlargest does in get_profile_recommendations.
+    """
+    match_percentage, scores = matcher.score_rows_against_cohort(bits[start:stop], bits, preferred_days)
+
+    ranked_rows = []
+    for offset in range(stop - start):
+        row_scores = scores[offset]
+        qualifying = match_percentage[offset] >= min_match_threshold
+        qualifying[start + offset] = False
+        candidates = np.flatnonzero(qualifying)
+
+        if limit is not None and len(candidates) > limit:
+            # Keep everything tied with the limit-th best score, then order exactly
+            kth = len(candidates) - limit
+            cutoff = np.partition(row_scores[candidates], kth)[kth]
+            candidates = candidates[row_scores[candidates] >= cutoff]
+
+        order = np.lexsort((candidates, -row_scores[candidates]))
+        if limit is not None:
+            order = order[:limit]
+        ranked_rows.append(candidates[order].tolist())
+
+    return ranked_rows
+
+# ===========================================
+# SKILL SEARCH
+# ===========================================
+
+class SkillSearchIndex:
+    """
+    In-process prefix index over skill names for type-ahead search
+
+    Every word start of a name is a key ('machine learning' and 'learning';
+    '-', '/', '.' and '(' also separate words), so 'lea' finds both
+    'Machine Learning' and 'scikit-learn'. Results rank whole-name prefix
+    matches first, then shorter names, then alphabetically.
+
+    This is a burst trie: names live in sorted leaf buckets of at most
+    max_results entries, and a bucket that overflows is split into child
+    nodes that each keep their best max_results names. A lookup walks at
+    most len(query) nodes and slices or filters one list of max_results
+    entries, so latency stays flat as the skills table grows, while memory
+    stays proportional to the number of names. Keys are split to at most
+    max_depth characters; deeper buckets just grow.
+    """
+
+    WORD_SEPARATORS = ' -/.(_'
+
+    def __init__(self, names: List[str] = None, max_results: int = 20, max_depth: int = 24):
+        self.max_results = max_results
+        self.max_depth = max_depth
+
+        # Node: [children by character (None for a leaf bucket), sorted entries]
+        # Entry: (word_offset > 0, length, lowered name, name, word_offset)
+        self.root = [{}, []]
+        self.names = {}
+        self._lock = threading.Lock()
+
+        for name in names or []:
+            self.add(name)
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return ' '.join(text.lower().split())
+
+    def add(self, name: str) -> bool:
+        """Index one skill name; returns False if it (case-insensitively) already exists"""
+        lowered = self._normalize(name)
+        if not lowered:
+            return False
+
+        with self._lock:
+            if lowered in self.names:
+                return False
+            self.names[lowered] = name
+
+            word_starts = [0] + [
+                i for i in range(1, len(lowered))
+                if lowered[i - 1] in self.WORD_SEPARATORS and lowered[i] not in self.WORD_SEPARATORS
+            ]
+            for start in word_starts:
+                self._insert((start > 0, len(lowered), lowered, name, start))
+        return True
+
+    def _key(self, entry: Tuple) -> str:
+        return entry[2][entry[4]:entry[4] + self.max_depth]
+
+    def _insert(self, entry: Tuple):
+        """Walk the entry's key down to its bucket, updating each node's best list"""
+        key = self._key(entry)
+        node, depth = self.root, 0
+        while node[0] is not None:
+            self._offer(node[1], entry)
+            if depth == len(key):
+                return
+            node = node[0].setdefault(key[depth], [None, []])
+            depth += 1
+
+        if self._offer(node[1], entry, bounded=False) and len(node[1]) > self.max_results:
+            self._burst(node, depth)
+
+    def _burst(self, node: List, depth: int):
+        """Split an overflowing bucket into child buckets keyed by the next character"""
+        if depth >= self.max_depth:
+            return
+
+        entries = node[1]
+        node[0], node[1] = {}, self._best(entries, self.max_results)
+        for entry in entries:
+            key = self._key(entry)
+            if len(key) > depth:
+                node[0].setdefault(key[depth], [None, []])[1].append(entry)  # stays sorted
+
+        for child in node[0].values():
+            if len(child[1]) > self.max_results:
+                self._burst(child, depth + 1)
+
+    def _offer(self, entries: List[Tuple], entry: Tuple, bounded: bool = True) -> bool:
+        """
+        Insert entry into a sorted list; False if skipped
+
+        Bounded lists are a node's best max_results distinct names. Buckets
+        are unbounded and keep one entry per key, since a later burst may
+        send two words of the same name to different children.
+        """
+        if bounded:
+            if len(entries) >= self.max_results and entry >= entries[-1]:
+                return False
+            for existing in entries:
+                if existing[3] == entry[3]:
+                    return False  # Already listed from an earlier (better-ranked) word of the same name
+        bisect.insort(entries, entry)
+        if bounded and len(entries) > self.max_results:
+            entries.pop()
+        return True
+
+    @staticmethod
+    def _best(entries: List[Tuple], limit: int) -> List[Tuple]:
+        """First `limit` entries of a sorted list with distinct names"""
+        seen, best = set(), []
+        for entry in entries:
+            if entry[3] not in seen:
+                seen.add(entry[3])
+                best.append(entry)
+                if len(best) == limit:
+                    break
+        return best
+
+    def search(self, query: str, limit: int = 10) -> List[str]:
+        """Top names with a word starting with query (best first)"""
+        query = self._normalize(query)
+        if not query:
+            return []
+
+        key = query[:self.max_depth]
+        node, depth = self.root, 0
+        while depth < len(key) and node[0] is not None:
+            node = node[0].get(key[depth])
+            if node is None:
+                return []
+            depth += 1
+
+        entries = node[1]
+        if depth < len(query):
+            # A bucket (or max_depth) was reached before the end of the query
+            entries = [entry for entry in entries if entry[2].startswith(query, entry[4])]
+        return [entry[3] for entry in self._best(entries, limit)]
+
+    def contains(self, name: str) -> bool:
+        """True if the name is indexed (case- and whitespace-insensitive)"""
+        return self._normalize(name) in self.names
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+# ===========================================
+# CONNECTION POOL
+# ===========================================
+
+class PostgresConnectionPool:
+    """
+    Thread-safe psycopg2 pool for WebScheduleMatcher's pooled mode.
+
+    Opens min_size connections up front and at most max_size in total.
+    Borrowers wait up to `timeout` seconds for a free connection (FIFO),
+    each connection can be pinged before it is handed out, and usage
+    counters are kept for get_stats(). Returned connections stay warm; idle
+    ones above min_size are closed after max_idle_seconds.
+    """
+
+    def __init__(self, connect_kwargs: Dict, min_size: int = 1, max_size: int = 10,
+                 timeout: float = 30.0, health_check: bool = True, max_idle_seconds: float = 300.0):
+        self.connect_kwargs = connect_kwargs
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check = health_check
+        self.max_idle_seconds = max_idle_seconds
+
+        # Borrowers queue FIFO so a thread that just returned a connection cannot jump the line
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._waiters = []
+        self.in_use = 0
+        # Idle connections as (connection, returned_at), most recently returned last
+        self._idle = []
+        self._closed = False
+        self.stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'wait_seconds': 0.0,
+            'timeouts': 0,
+            'health_check_failures': 0,
+            'peak_in_use': 0
+        }
+
+        now = time_module.monotonic()
+        for _ in range(min_size):
+            self._idle.append((psycopg2.connect(**connect_kwargs), now))
+
+    def checkout(self):
+        """Borrow a connection, waiting up to timeout seconds for one to free up"""
+        started = time_module.monotonic()
+        with self._available:
+            if self.in_use >= self.max_size or self._waiters:
+                self.stats['waits'] += 1
+                ticket = object()
+                self._waiters.append(ticket)
+                try:
+                    while self.in_use >= self.max_size or self._waiters[0] is not ticket:
+                        remaining = started + self.timeout - time_module.monotonic()
+                        if remaining <= 0:
+                            self.stats['timeouts'] += 1
+                            raise TimeoutError(f"No database connection available within {self.timeout}s")
+                        self._available.wait(remaining)
+                finally:
+                    self._waiters.remove(ticket)
+                    self._available.notify_all()
+
+            self.in_use += 1
+            self.stats['checkouts'] += 1
+            self.stats['wait_seconds'] += time_module.monotonic() - started
+            self.stats['peak_in_use'] = max(self.stats['peak_in_use'], self.in_use)
+            # Newest first, so surplus connections age out at the other end
+            conn = self._idle.pop()[0] if self._idle else None
+
+        try:
+            if conn is not None and self.health_check and not self._is_healthy(conn):
+                with self._lock:
+                    self.stats['health_check_failures'] += 1
+                self._close(conn)
+                conn = None
+            if conn is None:
+                conn = psycopg2.connect(**self.connect_kwargs)
+        except Exception:
+            self._release_slot()
+            raise
+        return conn
+
+    def checkin(self, conn):
+        """Return a borrowed connection, rolling back any open transaction"""
+        try:
+            # A no-op without a transaction; raises on a broken connection
+            if not conn.closed:
+                conn.rollback()
+        except psycopg2.Error:
+            self._close(conn)
+        finally:
+            self._release_slot(conn)
+
+    def _release_slot(self, conn=None):
+        """Free one checkout slot (keeping conn warm if usable) and wake the queued borrowers"""
+        stale = []
+        with self._available:
+            self.in_use -= 1
+            now = time_module.monotonic()
+            if conn is not None and not conn.closed:
+                if self._closed:
+                    stale.append(conn)
+                else:
+                    self._idle.append((conn, now))
+
+            # Close surplus connections that have sat idle too long
+            while (self._idle and self.in_use + len(self._idle) > self.min_size
+                   and now - self._idle[0][1] >= self.max_idle_seconds):
+                stale.append(self._idle.pop(0)[0])
+
+            self._available.notify_all()
+
+        for stale_conn in stale:
+            self._close(stale_conn)
+
+    @staticmethod
+    def _close(conn):
+        """Close a connection, ignoring errors from one that is already broken"""
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+    def _is_healthy(self, conn) -> bool:
+        """Round-trip a trivial query so dropped connections are replaced before use"""
+        if conn.closed:
+            return False
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def get_stats(self) -> Dict:
+        """Pool size and usage counters"""
+        with self._lock:
+            idle = len(self._idle)
+            return {
+                'type': 'psycopg2',
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'in_use': self.in_use,
+                'idle': idle,
+                'open': self.in_use + idle,
+                **self.stats
+            }
+
+    def closeall(self):
+        """Close idle connections now and borrowed ones as they are checked in"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._close(conn)
+
+# ===========================================
+# ASYNC MATCHER (asyncpg)
+# ===========================================
+
+class AsyncWebScheduleMatcher:
+    """
+    asyncio front end to WebScheduleMatcher for async web frameworks (FastAPI)
+
+    Data access goes through an asyncpg pool, so a slow query never blocks
+    the event loop, and each load runs the user/skills and availability
+    queries concurrently with asyncio.gather. Scoring is delegated to a
+    wrapped WebScheduleMatcher (scorer) that never connects: every entry
+    point awaits the profiles it needs, then hands them to the scorer as
+    users_data in a worker thread. The profile cache and its settings are
+    the scorer's. Needs a 'postgresql' config (pool_min_size, pool_max_size
+    and pool_timeout apply) and always scores in Python.
+    """
+
+    # Queries issued by the current request (one list per api_* call, shared with gathered tasks)
+    _request_queries = contextvars.ContextVar('request_queries', default=None)
+
+    def __init__(self, db_config: Optional[Dict] = None):
+        self.db_config = db_config
+        self.db_connection = None
+        self._connect_kwargs = None
+
+        self.scorer = WebScheduleMatcher(db_config)
+        self.days = self.scorer.days
+        self.time_slots = self.scorer.time_slots
+
+        self.recommendation_index = None
+        self.skill_index = None
 
-        # Load all required user data
-        all_user_ids = [user_id] + candidate_ids
-        users_data = self.load_user_profiles(all_user_ids)
+        # LISTEN/NOTIFY cache invalidation (see start_change_listener)
+        self._listener_task = None
+        self.listener_ready = asyncio.Event()
+        self.listener_stats = {'notifications': 0, 'profiles_changed': 0, 'reconnects': 0, 'errors': 0}
 
-        if user_id not in users_data:
-            return [{'error': 'User not found'}]
+        self.query_count = 0
 
-        for candidate_id in candidate_ids:
-            if candidate_id == user_id or candidate_id not in users_data:
-                continue
+    async def connect_to_database(self) -> bool:
+        """Open the asyncpg pool"""
+        try:
+            import asyncpg
+
+            if not self.db_config or self.db_config.get('type') != 'postgresql':
+                print("AsyncWebScheduleMatcher needs a 'postgresql' database configuration")
+                return False
 
-            # Calculate schedule match
-            match_result = self.calculate_schedule_match_percentage(
-                user_id, candidate_id, preferred_days
+            self._connect_kwargs = {
+                'host': self.db_config['host'],
+                'database': self.db_config['database'],
+                'user': self.db_config['user'],
+                'password': self.db_config['password'],
+                'port': self.db_config.get('port', 5432)
+            }
+            self.db_connection = await asyncpg.create_pool(
+                **self._connect_kwargs,
+                min_size=self.db_config.get('pool_min_size', 1),
+                max_size=self.db_config.get('pool_max_size', 10)
             )
+            print("Connected to PostgreSQL database (asyncpg)")
+            return True
 
-            if match_result['match_percentage'] >= min_match_threshold:
-                candidate_data = users_data[candidate_id]
-
-                recommendations.append({
-                    'user_id': candidate_id,
-                    'name': candidate_data['name'],
-                    'first_name': candidate_data['first_name'],
-                    'last_name': candidate_data['last_name'],
-                    'department': candidate_data['department'],
-                    'year': candidate_data['year'],
-                    'skills': candidate_data['skills'],
-                    'schedule_match': match_result,
-                    'recommendation_priority': match_result['recommendation_score']
-                })
+        except ImportError:
+            print("asyncpg not installed. Install with: pip install asyncpg")
+            return False
+        except Exception as e:
+            print(f"Database connection failed: {e}")
+            return False
 
-        # Sort by recommendation score (descending)
-        recommendations.sort(key=lambda x: x['recommendation_priority'], reverse=True)
+    async def close(self):
+        """Stop the change listener and close the asyncpg pool"""
+        await self.stop_change_listener()
+        if self.db_connection is not None:
+            await self.db_connection.close()
+            self.db_connection = None
 
-        return recommendations
+    def get_pool_stats(self) -> Dict:
+        """asyncpg pool usage"""
+        if self.db_connection is None:
+            return {}
+        size = self.db_connection.get_size()
+        idle = self.db_connection.get_idle_size()
+        return {
+            'type': 'asyncpg',
+            'min_size': self.db_connection.get_min_size(),
+            'max_size': self.db_connection.get_max_size(),
+            'in_use': size - idle,
+            'idle': idle,
+            'open': size
+        }
 
-    def find_team_meeting_slots(self, team_member_ids: List[str],
-                               preferred_days: List[str] = None,
-                               min_duration_hours: int = 2) -> Dict:
-        """
-        Find available meeting slots for a formed team
+    def _count_query(self, count: int = 1):
+        """Record database round trips against the matcher and the current request"""
+        self.query_count += count
+        request_queries = self._request_queries.get()
+        if request_queries is not None:
+            request_queries[0] += count
 
-        Args:
-        - team_member_ids: List of team member IDs
-        - preferred_days: Days to check for meetings
-        - min_duration_hours: Minimum meeting duration
+    def get_thread_query_count(self) -> int:
+        """Queries issued so far by the current request"""
+        request_queries = self._request_queries.get()
+        return request_queries[0] if request_queries is not None else 0
 
-        Returns:
-        - perfect_slots: 100% availability slots
-        - good_slots: High availability slots (80%+)
-        - backup_slots: Partial availability slots
-        - statistics: Overall analysis
-        """
+    def invalidate_cache(self, user_ids: List[str] = None):
+        """Drop cached profiles for the given USNs (all of them if None)"""
+        self.scorer.invalidate_cache(user_ids)
 
-        if len(team_member_ids) < 2:
-            return {'error': 'Need at least 2 team members'}
+    def get_cache_stats(self) -> Dict:
+        """Profile cache counters and occupancy"""
+        return self.scorer.get_cache_stats()
 
-        # Load team data
-        users_data = self.load_user_profiles(team_member_ids)
+    # ===========================================
+    # ASYNC DATA LOADING
+    # ===========================================
 
-        missing_users = [uid for uid in team_member_ids if uid not in users_data]
-        if missing_users:
-            return {'error': f'Users not found: {missing_users}'}
+    async def load_user_profiles(self, user_ids: List[str] = None) -> Dict:
+        """Load user profiles, serving fresh ones from the scorer's cache"""
+        try:
+            if not user_ids:
+                users_data = await self._load_from_database(user_ids)
+                self.scorer._cache_profiles(users_data)
+                return users_data
+
+            users_data, missing_ids = self.scorer._get_cached_profiles(user_ids)
+            if missing_ids:
+                loaded = await self._load_from_database(missing_ids)
+                self.scorer._cache_profiles(loaded)
+                users_data.update(loaded)
+            return users_data
 
-        if preferred_days is None:
-            preferred_days = self.days
+        except Exception as e:
+            print(f"Error loading user profiles: {e}")
+            return {}
 
-        perfect_slots = []
-        good_slots = []
-        backup_slots = []
-        day_statistics = {}
+    async def _fetch(self, query: str, *args) -> List:
+        """Run one query on its own pooled connection"""
+        async with self.db_connection.acquire(timeout=self.db_config.get('pool_timeout', 30.0)) as conn:
+            rows = await conn.fetch(query, *args)
+        self._count_query()
+        return rows
+
+    async def _load_from_database(self, user_ids: List[str] = None) -> Dict:
+        """Fetch users with skills and their availability concurrently"""
+        user_filter = ""
+        args = []
+        if user_ids:
+            user_filter = "WHERE u.usn = ANY($1)"
+            args.append(list(user_ids))
 
-        for day in preferred_days:
-            day_perfect = 0
-            day_good = 0
-            day_backup = 0
+        availability_query = f"""
+        {self.scorer._availability_select()}
+        {user_filter.replace('u.usn', 'usn')}
+        ORDER BY usn, day_of_week
+        """
 
-            # Check each standard time slot
-            for time_slot in self.time_slots:
-                available_members = []
+        users, availability = await asyncio.gather(
+            self._fetch(self.scorer._users_with_skills_query(user_filter), *args),
+            self._fetch(availability_query, *args)
+        )
 
-                for member_id in team_member_ids:
-                    member_schedule = users_data[member_id]['schedule'][day]['available']
+        users_data = {}
+        for user in users:
+            users_data[user['usn']] = {
+                'name': f"{user['first_name']} {user['last_name']}",
+                'first_name': user['first_name'],
+                'last_name': user['last_name'],
+                'department': user['department'],
+                'year': user['year'],
+                # asyncpg hands json columns back as text
+                'skills': json.loads(user['skills']) if user['skills'] else [],
+                'schedule': self.scorer._initialize_empty_schedule()
+            }
 
-                    # Check if this exact slot or any overlapping slot is available
-                    is_available = False
-                    if time_slot in member_schedule:
-                        is_available = True
-                    else:
-                        # Check for overlapping custom slots
-                        for member_slot in member_schedule:
-                            if self.get_overlapping_slots(time_slot, member_slot):
-                                is_available = True
-                                break
+        for avail in availability:
+            self.scorer._apply_availability_record(users_data, avail)
 
-                    if is_available:
-                        available_members.append(member_id)
+        return users_data
 
-                availability_percentage = (len(available_members) / len(team_member_ids)) * 100
+    # ===========================================
+    # ASYNC SCORING
+    # ===========================================
 
-                slot_info = {
-                    'day': day.capitalize(),
-                    'time_slot': self.time_slot_to_string(time_slot),
-                    'start_time': time_slot[0],
-                    'end_time': time_slot[1],
-                    'availability_percentage': round(availability_percentage, 1),
-                    'available_members': len(available_members),
-                    'total_members': len(team_member_ids),
-                    'available_member_names': [users_data[uid]['name'] for uid in available_members],
-                    'unavailable_member_names': [users_data[uid]['name']
-                                               for uid in team_member_ids if uid not in available_members]
-                }
+    async def calculate_schedule_match_percentage(self, user1_id: str, user2_id: str,
+                                                  preferred_days: List[str] = None) -> Dict:
+        """Awaitable calculate_schedule_match_percentage"""
+        users_data = await self.load_user_profiles([user1_id, user2_id])
+        return self.scorer.calculate_schedule_match_percentage(
+            user1_id, user2_id, preferred_days, users_data=users_data
+        )
 
-                if availability_percentage == 100:
-                    perfect_slots.append(slot_info)
-                    day_perfect += 1
-                elif availability_percentage >= 80:
-                    good_slots.append(slot_info)
-                    day_good += 1
-                elif availability_percentage >= 50:
-                    backup_slots.append(slot_info)
-                    day_backup += 1
+    async def get_profile_recommendations(self, user_id: str, candidate_ids: List[str],
+                                          preferred_days: List[str] = None,
+                                          min_match_threshold: float = 20.0,
+                                          limit: Optional[int] = None) -> List[Dict]:
+        """Awaitable get_profile_recommendations"""
+        users_data = await self.load_user_profiles([user_id] + candidate_ids)
+        return await asyncio.to_thread(
+            self.scorer.get_profile_recommendations,
+            user_id, candidate_ids, preferred_days, min_match_threshold, limit, users_data=users_data
+        )
 
-            day_statistics[day] = {
-                'perfect_slots': day_perfect,
-                'good_slots': day_good,
-                'backup_slots': day_backup,
-                'total_viable_slots': day_perfect + day_good + day_backup
-            }
+    async def find_team_meeting_slots(self, team_member_ids: List[str],
+                                      preferred_days: List[str] = None,
+                                      min_duration_hours: int = 2) -> Dict:
+        """Awaitable find_team_meeting_slots"""
+        if len(team_member_ids) < 2:
+            return {'error': 'Need at least 2 team members'}
 
-        # Calculate overall statistics
-        total_perfect = len(perfect_slots)
-        total_good = len(good_slots)
-        total_backup = len(backup_slots)
-        total_checked = len(preferred_days) * len(self.time_slots)
+        users_data = await self.load_user_profiles(team_member_ids)
+        return await asyncio.to_thread(
+            self.scorer.find_team_meeting_slots,
+            team_member_ids, preferred_days, min_duration_hours, users_data
+        )
 
-        success_rate = ((total_perfect + total_good) / total_checked * 100) if total_checked > 0 else 0
+    async def batch_profile_recommendations(self, user_ids: List[str] = None,
+                                            preferred_days: List[str] = None,
+                                            min_match_threshold: float = 20.0,
+                                            limit: Optional[int] = 10,
+                                            workers: Optional[int] = None,
+                                            block_size: int = 256) -> Dict[str, List[Dict]]:
+        """Awaitable batch_profile_recommendations"""
+        users_data = await self.load_user_profiles(user_ids)
+        return await asyncio.to_thread(
+            self.scorer.batch_profile_recommendations,
+            user_ids, preferred_days, min_match_threshold, limit, workers, block_size, users_data
+        )
 
-        return {
-            'team_info': {
-                'member_ids': team_member_ids,
-                'member_names': [users_data[uid]['name'] for uid in team_member_ids],
-                'team_size': len(team_member_ids)
-            },
-            'perfect_slots': perfect_slots[:10],  # Limit to top 10
-            'good_slots': good_slots[:10],
-            'backup_slots': backup_slots[:5],
-            'statistics': {
-                'total_perfect_slots': total_perfect,
-                'total_good_slots': total_good,
-                'total_backup_slots': total_backup,
-                'success_rate': round(success_rate, 1),
-                'day_breakdown': day_statistics,
-                'recommendation': self._get_meeting_recommendation(total_perfect, total_good, total_backup)
-            }
-        }
+    async def form_teams(self, user_ids: List[str] = None, team_size: int = 4,
+                         preferred_days: List[str] = None, time_budget_seconds: float = 2.0,
+                         time_weight: float = 1.0, skill_weight: float = 1.0) -> Dict:
+        """Awaitable form_teams"""
+        users_data = await self.load_user_profiles(user_ids)
+        return await asyncio.to_thread(
+            self.scorer.form_teams,
+            user_ids, team_size, preferred_days, time_budget_seconds, time_weight, skill_weight, users_data
+        )
+
+    async def build_recommendation_index(self, user_ids: List[str] = None, k: int = 10,
+                                         min_match_threshold: float = 20.0) -> 'RecommendationIndex':
+        """Awaitable build_recommendation_index (build it after wait_for_change_listener)"""
+        profiles = await self.load_user_profiles(user_ids)
+        index = RecommendationIndex(self.scorer, k=k, min_match_threshold=min_match_threshold,
+                                    max_age_seconds=self.scorer.index_max_age_seconds)
+        await asyncio.to_thread(index.build, user_ids, profiles=profiles)
+        self.recommendation_index = index
+        return index
+
+    async def update_recommendation_index(self, user_ids: List[str]):
+        """Reload the given students and patch them into the recommendation index"""
+        index = self.recommendation_index
+        if index is None:
+            return
+
+        self.invalidate_cache(user_ids)
+        # Load errors propagate: an empty result would drop these users from the index
+        profiles = await self._load_from_database(user_ids)
+        self.scorer._cache_profiles(profiles)
+        for user_id in user_ids:
+            await asyncio.to_thread(index.update_user, user_id, profiles)
 
     # ===========================================
-    # UTILITY METHODS
+    # ASYNC SKILL SEARCH
     # ===========================================
 
-    def _calculate_meeting_potential(self, day_breakdown: Dict) -> float:
-        """Calculate meeting potential score based on day distribution"""
-        total_score = 0
-        total_days = len(day_breakdown)
-
-        for day_data in day_breakdown.values():
-            # Weight recent days higher, prefer consistent availability
-            day_score = day_data['day_percentage']
-            if day_data['common_slots'] >= 3:  # Bonus for multiple slots per day
-                day_score *= 1.2
-            total_score += day_score
+    async def load_skill_names(self) -> List[str]:
+        """Every name in the skills table, in insertion order"""
+        return [row['name'] for row in await self._fetch("SELECT name FROM skills ORDER BY skill_id")]
 
-        return total_score / total_days if total_days > 0 else 0
+    async def build_skill_index(self, max_results: int = 20) -> 'SkillSearchIndex':
+        """Build the in-process skill name index and attach it to the matcher"""
+        index = SkillSearchIndex(await self.load_skill_names(), max_results=max_results)
+        self.skill_index = index
+        return index
 
-    def _calculate_recommendation_score(self, match_percentage: float, meeting_potential: float) -> float:
-        """Calculate overall recommendation score"""
-        # Weighted combination: 60% match percentage, 40% meeting potential
-        return (match_percentage * 0.6) + (meeting_potential * 0.4)
+    async def search_skills(self, query: str, limit: int = 10) -> List[str]:
+        """Awaitable search_skills (pg_trgm, SQL_scripts/skill_search.sql)"""
+        query = ' '.join(query.split())
+        if not query:
+            return []
 
-    def _get_meeting_recommendation(self, perfect: int, good: int, backup: int) -> str:
-        """Generate meeting recommendation based on available slots"""
-        if perfect >= 5:
-            return "Excellent - Multiple perfect meeting times available"
-        elif perfect >= 2:
-            return "Good - Several perfect meeting times available"
-        elif perfect >= 1 or good >= 3:
-            return "Fair - Some good meeting opportunities"
-        elif good >= 1 or backup >= 3:
-            return "Challenging - Limited meeting opportunities"
-        else:
-            return "Difficult - Very few meeting opportunities"
+        rows = await self._fetch("SELECT skill_id, name FROM search_skills($1, $2)", query, limit)
+        return [row['name'] for row in rows]
 
     # ===========================================
-    # WEB API READY METHODS
+    # PUSH INVALIDATION (LISTEN/NOTIFY)
     # ===========================================
 
-    def api_get_profile_recommendations(self, user_id: str, params: Dict) -> Dict:
+    async def start_change_listener(self, channel: str = 'profile_changes', refresh: bool = False,
+                                    poll_seconds: float = 1.0) -> bool:
         """
-        API endpoint for getting profile recommendations
+        Evict cached profiles as soon as the database reports a change
 
-        Expected params:
-        - candidate_ids: List[str]
-        - preferred_days: Optional[List[str]]
-        - min_match_threshold: Optional[float]
-        - limit: Optional[int]
+        Same contract as WebScheduleMatcher.start_change_listener, run as a
+        task on the event loop with its own asyncpg connection. Changed
+        students are reloaded into the recommendation index if one is built.
+        Call after connect_to_database; listener_ready is an asyncio.Event.
         """
+        if self._listener_task is not None and not self._listener_task.done():
+            return True
+
+        if self._connect_kwargs is None:
+            print("Change listener needs a connected AsyncWebScheduleMatcher")
+            return False
+
+        self._listener_task = asyncio.create_task(self._listen_for_changes(channel, refresh, poll_seconds))
+        return True
+
+    async def stop_change_listener(self):
+        """Cancel the listener task and close its connection"""
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+        self.listener_ready.clear()
+
+    async def wait_for_change_listener(self, timeout: float = 10.0) -> bool:
+        """Wait until the listener is LISTENing with the triggers in place; False on timeout"""
+        try:
+            await asyncio.wait_for(self.listener_ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _listen_for_changes(self, channel: str, refresh: bool, poll_seconds: float):
+        """Listener task body: collect notifications, apply them in batches, reconnect on failure"""
+        import asyncpg
+
+        changed = asyncio.Queue()
+        conn = None
+        connected_before = False
+        try:
+            while True:
+                try:
+                    if conn is None or conn.is_closed():
+                        conn = await asyncpg.connect(**self._connect_kwargs)
+                        await conn.add_listener(
+                            channel, lambda _conn, _pid, _channel, payload: changed.put_nowait(payload)
+                        )
+                        missing = self.scorer._missing_notify_triggers(
+                            row[0] for row in await conn.fetch(_NOTIFY_TRIGGER_TABLES_SQL)
+                        )
+                        if connected_before:
+                            self.listener_stats['reconnects'] += 1
+                            self.invalidate_cache()
+                            await self._rebuild_recommendation_index()
+                        connected_before = True
+                        if missing:
+                            print(f"No change notifications from {missing}: "
+                                  f"run SQL_scripts/profile_change_notify.sql")
+                        else:
+                            self.listener_ready.set()
+
+                    index = self.recommendation_index
+                    if index is not None and index.expired():
+                        await self._rebuild_recommendation_index()
+
+                    try:
+                        usns = [await asyncio.wait_for(changed.get(), poll_seconds)]
+                    except asyncio.TimeoutError:
+                        continue
+                    while not changed.empty():
+                        usns.append(changed.get_nowait())
+
+                    self.listener_stats['notifications'] += len(usns)
+                    await self._apply_profile_changes(list(dict.fromkeys(usns)), refresh)
+
+                except Exception as e:
+                    print(f"Profile change listener error: {e}")
+                    self.listener_stats['errors'] += 1
+                    self.listener_ready.clear()
+                    if conn is not None:
+                        conn.terminate()
+                        conn = None
+                    await asyncio.sleep(poll_seconds)
+        finally:
+            if conn is not None:
+                await conn.close()
+
+    async def _apply_profile_changes(self, usns: List[str], refresh: bool):
+        """Drop (or reload) changed profiles and patch the recommendation index"""
+        self.listener_stats['profiles_changed'] += len(usns)
+        self.invalidate_cache(usns)
+
+        if self.recommendation_index is not None:
+            await self.update_recommendation_index(usns)
+        elif refresh:
+            await self.load_user_profiles(usns)
+
+    async def _rebuild_recommendation_index(self):
+        """Reload the recommendation index after notifications may have been missed (stale until done)"""
+        index = self.recommendation_index
+        if index is None:
+            return
+
+        index.stale = True
+        profiles = await self._load_from_database(index.source_ids)
+        self.scorer._cache_profiles(profiles)
+        await asyncio.to_thread(index.build, index.source_ids, profiles=profiles)
+
+    # ===========================================
+    # ASYNC WEB API METHODS
+    # ===========================================
+
+    async def api_get_profile_recommendations(self, user_id: str, params: Dict) -> Dict:
+        """Awaitable api_get_profile_recommendations"""
         try:
+            request_queries = [0]
+            self._request_queries.set(request_queries)
             candidate_ids = params.get('candidate_ids', [])
             preferred_days = params.get('preferred_days', self.days)
             min_threshold = params.get('min_match_threshold', 20.0)
             limit = params.get('limit', 10)
 
-            recommendations = self.get_profile_recommendations(
-                user_id, candidate_ids, preferred_days, min_threshold
+            index = self.recommendation_index
+            if not candidate_ids and index is not None and index.can_serve(preferred_days, min_threshold, limit):
+                recommendations = index.get_recommendations(user_id, limit)
+                return {
+                    'success': True,
+                    'data': recommendations,
+                    'total_candidates': index.size(),
+                    'returned_recommendations': len(recommendations),
+                    'queries_issued': request_queries[0]
+                }
+
+            recommendations = await self.get_profile_recommendations(
+                user_id, candidate_ids, preferred_days, min_threshold, limit
             )
 
             return {
                 'success': True,
                 'data': recommendations[:limit],
                 'total_candidates': len(candidate_ids),
-                'returned_recommendations': len(recommendations[:limit])
+                'returned_recommendations': len(recommendations[:limit]),
+                'queries_issued': request_queries[0]
             }
         except Exception as e:
             return {
@@ -742,31 +3341,28 @@ class WebScheduleMatcher:
                 'error': str(e)
             }
 
-    def api_get_team_meeting_slots(self, params: Dict) -> Dict:
-        """
-        API endpoint for getting team meeting slots
-
-        Expected params:
-        - team_member_ids: List[str]
-        - preferred_days: Optional[List[str]]
-        - min_duration_hours: Optional[int]
-        """
+    async def api_get_team_meeting_slots(self, params: Dict) -> Dict:
+        """Awaitable api_get_team_meeting_slots"""
         try:
+            request_queries = [0]
+            self._request_queries.set(request_queries)
             team_ids = params.get('team_member_ids', [])
             preferred_days = params.get('preferred_days', self.days)
             min_duration = params.get('min_duration_hours', 2)
 
-            result = self.find_team_meeting_slots(team_ids, preferred_days, min_duration)
+            result = await self.find_team_meeting_slots(team_ids, preferred_days, min_duration)
 
             if 'error' in result:
                 return {
                     'success': False,
-                    'error': result['error']
+                    'error': result['error'],
+                    'queries_issued': request_queries[0]
                 }
 
             return {
                 'success': True,
-                'data': result
+                'data': result,
+                'queries_issued': request_queries[0]
             }
         except Exception as e:
             return {
@@ -833,14 +3429,532 @@ def example_usage():
 
         print("Team Meeting Slots:", json.dumps(meeting_slots, indent=2))
 
+def benchmark_team_meeting_slots(team_size: int = 10, iterations: int = 200, seed: int = 0) -> Dict:
+    """
+    Benchmark team slot evaluation: string-parsed slot sets vs packed masks
+
+    Uses synthetic rows shaped like the form's submissions (including the
+    22:00-23:59 slot). The baseline reproduces the old per-member loop that
+    re-parsed 'HH:MM' strings for every overlap check; the packed path
+    normalizes rows once and runs find_team_meeting_slots on the masks.
+    """
+    import random
+    import timeit
+
+    rng = random.Random(seed)
+    matcher = WebScheduleMatcher()
+    form_slots = matcher.form_time_slots
+    team_ids = [f'BENCH{idx:03d}' for idx in range(team_size)]
+    rows = [
+        (usn, day_num, start, end, rng.random() < 0.5)
+        for usn in team_ids
+        for day_num in range(len(matcher.days))
+        for start, end in form_slots
+    ]
+
+    def string_overlap(slot1, slot2):
+        def time_to_minutes(time_str):
+            hours, minutes = map(int, time_str.split(':'))
+            return hours * 60 + minutes
+
+        start1, end1 = map(time_to_minutes, slot1)
+        start2, end2 = map(time_to_minutes, slot2)
+        if end1 <= start1:
+            end1 += 24 * 60
+        if end2 <= start2:
+            end2 += 24 * 60
+        return not (end1 <= start2 or end2 <= start1)
+
+    def string_sets():
+        schedules = {usn: {day: set() for day in matcher.days} for usn in team_ids}
+        for usn, day_num, start, end, is_available in rows:
+            if is_available:
+                schedules[usn][matcher.days[day_num]].add((start, end))
+
+        counts = []
+        for day in matcher.days:
+            for time_slot in matcher.time_slots:
+                available = 0
+                for usn in team_ids:
+                    member_schedule = schedules[usn][day]
+                    if time_slot in member_schedule or any(
+                            string_overlap(time_slot, member_slot) for member_slot in member_schedule):
+                        available += 1
+                counts.append(available)
+        return counts
+
+    def packed_masks():
+        users_data = {
+            usn: {'name': usn, 'schedule': matcher._initialize_empty_schedule()} for usn in team_ids
+        }
+        for usn, day_num, start, end, is_available in rows:
+            matcher._apply_availability(users_data[usn]['schedule'], day_num, start, end, is_available)
+        return matcher.find_team_meeting_slots(team_ids, users_data=users_data)
+
+    string_seconds = timeit.timeit(string_sets, number=iterations) / iterations
+    packed_seconds = timeit.timeit(packed_masks, number=iterations) / iterations
+
+    result = {
+        'team_size': team_size,
+        'string_sets_ms': round(string_seconds * 1000, 3),
+        'packed_masks_ms': round(packed_seconds * 1000, 3),
+        'speedup': round(string_seconds / packed_seconds, 1) if packed_seconds > 0 else None
+    }
+    print("Team meeting slot benchmark:", json.dumps(result))
+    return result
+
+def benchmark_batch_recommendations(cohort_size: int = 4000, workers: Optional[int] = None,
+                                    limit: int = 10, seed: int = 0) -> Dict:
+    """
+    Benchmark batch_profile_recommendations in one process vs a process pool
+
+    Uses a synthetic cohort with ~30% availability; workers defaults to the
+    CPU count. Both runs return identical lists.
+    """
+    import random
+
+    rng = random.Random(seed)
+    matcher = WebScheduleMatcher()
+    users_data = {}
+    for idx in range(cohort_size):
+        schedule = matcher._initialize_empty_schedule()
+        schedule['available'] = sum(1 << bit for bit in range(84) if rng.random() < 0.3)
+        users_data[f'BENCH{idx:05d}'] = {
+            'name': f'Student {idx}', 'first_name': 'Student', 'last_name': str(idx),
+            'department': 'CSE', 'year': 2, 'skills': [], 'schedule': schedule
+        }
+
+    workers = workers or os.cpu_count() or 1
+    timings = {}
+    for label, worker_count in (('single_process_s', 1), ('process_pool_s', workers)):
+        started = time_module.perf_counter()
+        matcher.batch_profile_recommendations(limit=limit, workers=worker_count, users_data=users_data)
+        timings[label] = round(time_module.perf_counter() - started, 3)
+
+    result = {
+        'cohort_size': cohort_size,
+        'workers': workers,
+        **timings,
+        'speedup': round(timings['single_process_s'] / timings['process_pool_s'], 2)
+        if timings['process_pool_s'] > 0 else None
+    }
+    print("Batch recommendation benchmark:", json.dumps(result))
+    return result
+
 # ===========================================
 # HELPER FUNCTIONS FOR DATA INSERTION
 # ===========================================
 
+# Synthetic cohorts draw skills from SQL_scripts/skills.sql and departments from
+# db_connection.get_departments(); each department gets its own skill pool
+_SYNTHETIC_DEPARTMENTS = [
+    ('CS', 'Computer Science Engineering (CS)',
+     ['Python', 'Java', 'C++', 'JavaScript', 'TypeScript', 'Go', 'React', 'Node.js', 'Django',
+      'SQL', 'PostgreSQL', 'MongoDB', 'Docker', 'Linux', 'AWS', 'Machine Learning']),
+    ('AD', 'Artificial Intelligence and Data Science (AD)',
+     ['Python', 'R', 'SQL', 'Machine Learning', 'Deep Learning', 'Neural Networks',
+      'Computer Vision', 'Natural Language Processing', 'TensorFlow', 'PyTorch',
+      'scikit-learn', 'Data Visualization', 'Big Data', 'Spark', 'Transformers']),
+    ('CB', 'Computer Science and Business Systems (CB)',
+     ['Python', 'Java', 'SQL', 'JavaScript', 'React', 'Spring Boot', 'Data Visualization',
+      'MySQL', 'Project Management', 'Agile', 'Scrum', 'Azure', 'Data Mining']),
+    ('EC', 'Electronics and Communications Engineering (EC)',
+     ['C++', 'Python', 'MATLAB', 'Embedded Systems', 'Arduino', 'Raspberry Pi', 'VLSI',
+      'FPGA', 'Verilog', 'VHDL', 'PCB Design', 'Circuit Design', 'Signal Processing', 'IoT']),
+    ('ME', 'Mechanical Engineering (ME)',
+     ['CAD', 'SolidWorks', 'AutoCAD', 'ANSYS', 'Finite Element Analysis', 'Thermodynamics',
+      'Fluid Mechanics', 'Mechatronics', 'Robotics', 'MATLAB', 'Python']),
+    ('CV', 'Civil Engineering (CV)',
+     ['AutoCAD', 'AutoCAD Civil 3D', 'Revit', 'STAAD.Pro', 'ETABS', 'Construction Management',
+      'Structural Analysis', 'Environmental Engineering', 'Transportation Engineering',
+      'Project Management']),
+]
+
+_SYNTHETIC_SOFT_SKILLS = ['Leadership', 'Communication', 'Problem Solving', 'Critical Thinking',
+                          'Teamwork', 'Time Management']
+
+_SYNTHETIC_FIRST_NAMES = ['Aarav', 'Aditi', 'Akash', 'Ananya', 'Arjun', 'Bhavana', 'Chetan',
+                          'Deepa', 'Divya', 'Gautam', 'Harini', 'Ishaan', 'Kavya', 'Kiran',
+                          'Meera', 'Nikhil', 'Pooja', 'Rahul', 'Rohan', 'Sahana', 'Sanjay',
+                          'Shreya', 'Sneha', 'Tejas', 'Varun', 'Vidya']
+
+_SYNTHETIC_LAST_NAMES = ['Bhat', 'Gowda', 'Hegde', 'Iyer', 'Joshi', 'Kamath', 'Kulkarni',
+                         'Menon', 'Nair', 'Patil', 'Prasad', 'Rao', 'Reddy', 'Shenoy',
+                         'Shetty', 'Sharma', 'Naik', 'Murthy']
+
+# Column lists and conflict keys for the tables bulk_insert_cohort writes
+_COHORT_TABLES = {
+    'sample_users': (('usn', 'first_name', 'last_name', 'department', 'year'), ('usn',)),
+    'sample_user_skills': (('usn', 'skill_id', 'proficiency_level'), ('usn', 'skill_id')),
+    'sample_user_availability': (
+        ('usn', 'day_of_week', 'time_slot_start', 'time_slot_end', 'is_available'),
+        ('usn', 'day_of_week', 'time_slot_start', 'time_slot_end')
+    ),
+    'sample_user_availability_mask': (('usn', 'day_of_week', 'slot_mask'), ('usn', 'day_of_week')),
+}
+
+
+def _synthetic_usn(batch: int, dept_code: str, serial: int) -> str:
+    """10-character USN in the form's layout; the college code starts at 9AA so it never hits 1KG"""
+    college, roll = divmod(serial, 1000)
+    prefix = f"{9 - college // 676}{chr(65 + college // 26 % 26)}{chr(65 + college % 26)}"
+    return f"{prefix}{batch:02d}{dept_code}{roll:03d}"
+
+
+def generate_synthetic_cohort(num_users: int = 10000, seed: int = 0,
+                              intake_year: int = 25) -> Dict:
+    """
+    Deterministic synthetic students for load tests.
+
+    Availability is correlated the way a real college's is: every
+    (department, year) group shares a weekday timetable, each year has a
+    common free afternoon across departments, and students differ only in
+    how much of their free time (evenings, weekends) they offer. Skills come
+    mostly from the department's pool, with proficiency rising by year.
+
+    Returns {'users': [(usn, first, last, department, year)], 'skills': [name],
+    'user_skills': [(usn, skill_name, level)], 'day_masks': [(usn, day, mask)]}
+    where mask bit i is matcher.time_slots[i]. The same seed always yields
+    the same cohort.
+    """
+    rng = random.Random(seed)
+    class_slots = range(4, 9)   # 08:00-18:00
+    evening_slots = (9, 10)     # 18:00-22:00
+
+    # Shared timetables: (department, year) -> weekday -> busy slot mask
+    free_afternoon = {year: rng.choice(range(1, 6)) for year in range(1, 5)}
+    timetables = {}
+    for dept_code, _, _ in _SYNTHETIC_DEPARTMENTS:
+        for year in range(1, 5):
+            week = {}
+            for day in range(1, 6):
+                busy = rng.sample(class_slots, rng.randint(3, 4))
+                if day == free_afternoon[year]:
+                    busy = [slot for slot in busy if slot < 6]
+                week[day] = sum(1 << slot for slot in busy)
+            timetables[dept_code, year] = week
+
+    users, user_skills, day_masks = [], [], []
+    skills = set(_SYNTHETIC_SOFT_SKILLS)
+    serials = defaultdict(int)
+
+    for _ in range(num_users):
+        dept_code, department, pool = rng.choice(_SYNTHETIC_DEPARTMENTS)
+        year = rng.randint(1, 4)
+        batch = intake_year - year + 1
+        usn = _synthetic_usn(batch, dept_code, serials[dept_code, year])
+        serials[dept_code, year] += 1
+
+        users.append((usn, rng.choice(_SYNTHETIC_FIRST_NAMES), rng.choice(_SYNTHETIC_LAST_NAMES),
+                      department, year))
+
+        # Per-student propensities shift availability around the shared timetable
+        free_rate = rng.uniform(0.5, 0.95)
+        evening_rate = rng.uniform(0.2, 0.9)
+        weekend_rate = rng.uniform(0.1, 0.8)
+        timetable = timetables[dept_code, year]
+
+        for day in range(7):
+            mask = 0
+            if 1 <= day <= 5:
+                for slot in class_slots:
+                    if not timetable[day] >> slot & 1 and rng.random() < free_rate:
+                        mask |= 1 << slot
+            else:
+                for slot in class_slots:
+                    if rng.random() < weekend_rate:
+                        mask |= 1 << slot
+            for slot in evening_slots:
+                if rng.random() < evening_rate:
+                    mask |= 1 << slot
+            if rng.random() < evening_rate / 4:
+                mask |= 1 << 11
+            if rng.random() < 0.1:
+                mask |= 1 << 3
+            day_masks.append((usn, day, mask))
+
+        picked = rng.sample(pool, min(len(pool), rng.randint(1, 5)))
+        if rng.random() < 0.4:
+            picked.append(rng.choice(_SYNTHETIC_SOFT_SKILLS))
+        for skill in picked:
+            level = min(5, max(1, round(rng.gauss(1.5 + 0.6 * year, 1.0))))
+            user_skills.append((usn, skill, level))
+        skills.update(picked)
+
+    return {
+        'users': users,
+        'skills': sorted(skills | {name for _, _, pool in _SYNTHETIC_DEPARTMENTS for name in pool}),
+        'user_skills': user_skills,
+        'day_masks': day_masks
+    }
+
+
+def _cohort_availability(matcher: WebScheduleMatcher, cohort: Dict):
+    """(table, rows) for the cohort's availability in the matcher's storage layout"""
+    if matcher.availability_storage == 'compact':
+        if 'day_masks' in cohort:
+            return 'sample_user_availability_mask', iter(cohort['day_masks'])
+
+        # Derive masks from explicit rows the way the loader reads them (either slot layout);
+        # slots without an available row stay clear
+        masks = defaultdict(int)
+        for usn, day, start, end, available in cohort.get('availability', []):
+            time_slot = (matcher._format_slot_time(start), matcher._format_slot_time(end))
+            masks[usn, day] |= matcher._slot_bits(0, time_slot) if available else 0
+        return 'sample_user_availability_mask', (
+            (usn, day, mask) for (usn, day), mask in masks.items()
+        )
+
+    if 'availability' in cohort:
+        return 'sample_user_availability', iter(cohort['availability'])
+
+    # One row per slot, as the form writes them
+    return 'sample_user_availability', (
+        (usn, day, start, end, bool(mask >> idx & 1))
+        for usn, day, mask in cohort.get('day_masks', [])
+        for idx, (start, end) in enumerate(matcher.form_time_slots)
+    )
+
+
+def _chunked(rows, size: int):
+    """Yield lists of at most `size` rows from any iterable"""
+    iterator = iter(rows)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _create_staging_sql(table: str, staging: str) -> str:
+    """Transaction-scoped temp table shaped like `table`"""
+    return f"CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"
+
+
+def _upsert_from_sql(table: str, source: str) -> str:
+    """INSERT ... SELECT from a staging table, updating non-key columns on conflict"""
+    columns, keys = _COHORT_TABLES[table]
+    updates = [col for col in columns if col not in keys]
+    action = ("DO UPDATE SET " + ", ".join(f"{col} = EXCLUDED.{col}" for col in updates)
+              if updates else "DO NOTHING")
+    column_list = ", ".join(columns)
+    return (f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {source} "
+            f"ON CONFLICT ({', '.join(keys)}) {action}")
+
+
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def _copy_value(value) -> str:
+    """One field in COPY text format"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, int):
+        return str(value)
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def _copy_rows(cursor, staging: str, columns, rows, chunk_size: int) -> int:
+    """Stream rows into a table with COPY, one in-memory buffer per chunk"""
+    import io
+
+    written = 0
+    for chunk in _chunked(rows, chunk_size):
+        buffer = io.StringIO()
+        buffer.writelines("\t".join(map(_copy_value, row)) + "\n" for row in chunk)
+        buffer.seek(0)
+        cursor.copy_expert(f"COPY {staging} ({', '.join(columns)}) FROM STDIN", buffer)
+        written += len(chunk)
+    return written
+
+
+def _copy_upsert(cursor, table: str, rows, chunk_size: int) -> int:
+    """COPY rows into a temp staging table, then upsert them in one statement"""
+    columns, _ = _COHORT_TABLES[table]
+    staging = f"{table}_staging"
+    cursor.execute(_create_staging_sql(table, staging))
+    written = _copy_rows(cursor, staging, columns, rows, chunk_size)
+    cursor.execute(_upsert_from_sql(table, staging))
+    return written
+
+
+def _expand_day_masks_sql(starts: str, ends: str) -> str:
+    """Upsert one sample_user_availability row per slot from the cohort_day_masks temp table"""
+    columns, keys = _COHORT_TABLES['sample_user_availability']
+    return f"""
+        INSERT INTO sample_user_availability ({', '.join(columns)})
+        SELECT m.usn, m.day_of_week, s.time_slot_start, s.time_slot_end,
+               (m.slot_mask >> (s.slot - 1)::INTEGER) & 1 = 1
+        FROM cohort_day_masks m
+        CROSS JOIN unnest(CAST({starts} AS time[]), CAST({ends} AS time[])) WITH ORDINALITY
+            AS s(time_slot_start, time_slot_end, slot)
+        ON CONFLICT ({', '.join(keys)}) DO UPDATE SET is_available = EXCLUDED.is_available
+    """
+
+
+_CREATE_DAY_MASKS_SQL = ("CREATE TEMP TABLE cohort_day_masks "
+                         "(usn TEXT, day_of_week SMALLINT, slot_mask INTEGER) ON COMMIT DROP")
+
+
+def bulk_insert_cohort(matcher: WebScheduleMatcher, cohort: Dict, chunk_size: int = None) -> Dict:
+    """
+    Write a cohort (see generate_synthetic_cohort) with set-based statements.
+
+    Postgres COPYs into temp staging tables and SQLAlchemy fills them with
+    executemany (sent as multi-row VALUES batches); each table is then
+    upserted with one INSERT ... SELECT ... ON CONFLICT.
+    Supabase upserts chunks of rows concurrently. Skills are matched by name,
+    so existing skill ids are reused. Returns row counts and elapsed seconds.
+    """
+    if not matcher.db_connection:
+        print("No database connection available")
+        return {}
+
+    db_type = matcher.db_config['type']
+    chunk_size = chunk_size or (1000 if db_type == 'supabase' else 50000)
+    availability_table, availability_rows = _cohort_availability(matcher, cohort)
+    # Per-slot storage is 12x the mask rows; the SQL backends expand masks server-side
+    expand_masks = availability_table == 'sample_user_availability' and 'availability' not in cohort
+    slot_params = {'starts': [start for start, _ in matcher.form_time_slots],
+                   'ends': [end for _, end in matcher.form_time_slots]}
+    skill_names = sorted({name for name in cohort.get('skills', [])} |
+                         {name for _, name, _ in cohort.get('user_skills', [])})
+    started = time_module.perf_counter()
+    counts = {}
+
+    def user_skill_rows(skill_ids):
+        return ((usn, skill_ids[name], level) for usn, name, level in cohort.get('user_skills', []))
+
+    if db_type == 'postgresql':
+        with matcher._pg_connection() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        "INSERT INTO skills (name) SELECT unnest(%s::text[]) ON CONFLICT (name) DO NOTHING",
+                        (skill_names,)
+                    )
+                    cursor.execute("SELECT skill_id, name FROM skills WHERE name = ANY(%s)", (skill_names,))
+                    skill_ids = {name: skill_id for skill_id, name in cursor.fetchall()}
+
+                    counts['users'] = _copy_upsert(cursor, 'sample_users', cohort['users'], chunk_size)
+                    counts['user_skills'] = _copy_upsert(
+                        cursor, 'sample_user_skills', user_skill_rows(skill_ids), chunk_size
+                    )
+                    if expand_masks:
+                        cursor.execute(_CREATE_DAY_MASKS_SQL)
+                        counts['availability'] = matcher.slots_per_day * _copy_rows(
+                            cursor, 'cohort_day_masks', ('usn', 'day_of_week', 'slot_mask'),
+                            cohort.get('day_masks', []), chunk_size
+                        )
+                        cursor.execute(_expand_day_masks_sql('%(starts)s', '%(ends)s'), slot_params)
+                    else:
+                        counts['availability'] = _copy_upsert(
+                            cursor, availability_table, availability_rows, chunk_size
+                        )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    elif db_type == 'sqlalchemy':
+        from sqlalchemy import column, insert, table, text
+
+        def insert_rows(conn, table_name, columns, rows):
+            statement = insert(table(table_name, *(column(col) for col in columns)))
+            written = 0
+            for chunk in _chunked(rows, chunk_size):
+                conn.execute(statement, [dict(zip(columns, row)) for row in chunk])
+                written += len(chunk)
+            return written
+
+        def upsert(conn, table_name, rows):
+            # Plain INSERT executemany is batched into multi-row VALUES; ON CONFLICT is not,
+            # so stage the rows and upsert them in one statement
+            columns, _ = _COHORT_TABLES[table_name]
+            staging = f"{table_name}_staging"
+            conn.execute(text(_create_staging_sql(table_name, staging)))
+            written = insert_rows(conn, staging, columns, rows)
+            conn.execute(text(_upsert_from_sql(table_name, staging)))
+            return written
+
+        with matcher.db_connection.begin() as conn:
+            conn.execute(
+                text("INSERT INTO skills (name) SELECT unnest(CAST(:names AS text[])) "
+                     "ON CONFLICT (name) DO NOTHING"),
+                {'names': skill_names}
+            )
+            skill_ids = {
+                row.name: row.skill_id for row in conn.execute(
+                    text("SELECT skill_id, name FROM skills WHERE name = ANY(:names)"),
+                    {'names': skill_names}
+                )
+            }
+            counts['users'] = upsert(conn, 'sample_users', cohort['users'])
+            counts['user_skills'] = upsert(conn, 'sample_user_skills', user_skill_rows(skill_ids))
+            if expand_masks:
+                conn.execute(text(_CREATE_DAY_MASKS_SQL))
+                counts['availability'] = matcher.slots_per_day * insert_rows(
+                    conn, 'cohort_day_masks', ('usn', 'day_of_week', 'slot_mask'),
+                    cohort.get('day_masks', [])
+                )
+                conn.execute(text(_expand_day_masks_sql(':starts', ':ends')), slot_params)
+            else:
+                counts['availability'] = upsert(conn, availability_table, availability_rows)
+
+    elif db_type == 'supabase':
+        client = matcher.db_connection
+
+        def upsert(table_name, rows):
+            columns, keys = _COHORT_TABLES[table_name]
+
+            def send(chunk):
+                client.table(table_name).upsert(
+                    [dict(zip(columns, row)) for row in chunk], on_conflict=','.join(keys)
+                ).execute()
+                return len(chunk)
+
+            # Keep a bounded number of chunks in flight so large cohorts stream
+            written = 0
+            with ThreadPoolExecutor(max_workers=matcher.page_workers) as executor:
+                pending = set()
+                for chunk in _chunked(rows, chunk_size):
+                    if len(pending) >= 2 * matcher.page_workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        written += sum(future.result() for future in done)
+                    pending.add(executor.submit(send, chunk))
+                written += sum(future.result() for future in pending)
+            return written
+
+        # An unfiltered select stops at one PostgREST page, so look ids up per chunk of names
+        # (kept short enough for the in.() filter to fit in the request URL)
+        skill_ids = {}
+        for names in _chunked(skill_names, 200):
+            client.table('skills').upsert(
+                [{'name': name} for name in names], on_conflict='name', ignore_duplicates=True
+            ).execute()
+            rows = client.table('skills').select('skill_id, name').in_('name', names).execute().data
+            skill_ids.update((row['name'], row['skill_id']) for row in rows)
+        counts['users'] = upsert('sample_users', cohort['users'])
+        counts['user_skills'] = upsert('sample_user_skills', user_skill_rows(skill_ids))
+        counts['availability'] = upsert(availability_table, availability_rows)
+
+    else:
+        print(f"Bulk insert not supported for database type: {db_type}")
+        return {}
+
+    counts['seconds'] = round(time_module.perf_counter() - started, 3)
+    print(f"Inserted {counts['users']} users, {counts['user_skills']} user skills and "
+          f"{counts['availability']} availability rows in {counts['seconds']} s")
+    return counts
+
+
 def insert_sample_data(matcher: WebScheduleMatcher):
     """
     Helper function to insert sample data for testing
-    Use this to populate your database with test data
+    Use this to populate your database with test data;
+    for load tests use bulk_insert_cohort(matcher, generate_synthetic_cohort(100000))
     """
 
     if not matcher.db_connection:
@@ -856,30 +3970,18 @@ def insert_sample_data(matcher: WebScheduleMatcher):
         ('USN005', 'David', 'Brown', 'Information Technology', 4)
     ]
 
-    # Sample skills
-    sample_skills = [
-        (1, 'Python'),
-        (2, 'JavaScript'),
-        (3, 'Java'),
-        (4, 'React'),
-        (5, 'Node.js'),
-        (6, 'Machine Learning'),
-        (7, 'Database Design'),
-        (8, 'Web Development')
-    ]
-
     # Sample user skills
     sample_user_skills = [
-        ('USN001', 1, 4),  # John - Python (4/5)
-        ('USN001', 6, 3),  # John - ML (3/5)
-        ('USN002', 2, 5),  # Jane - JavaScript (5/5)
-        ('USN002', 4, 4),  # Jane - React (4/5)
-        ('USN003', 3, 3),  # Mike - Java (3/5)
-        ('USN003', 7, 4),  # Mike - Database (4/5)
-        ('USN004', 8, 4),  # Sarah - Web Dev (4/5)
-        ('USN004', 2, 3),  # Sarah - JavaScript (3/5)
-        ('USN005', 5, 5),  # David - Node.js (5/5)
-        ('USN005', 1, 4),  # David - Python (4/5)
+        ('USN001', 'Python', 4),
+        ('USN001', 'Machine Learning', 3),
+        ('USN002', 'JavaScript', 5),
+        ('USN002', 'React', 4),
+        ('USN003', 'Java', 3),
+        ('USN003', 'Database Design', 4),
+        ('USN004', 'Web Development', 4),
+        ('USN004', 'JavaScript', 3),
+        ('USN005', 'Node.js', 5),
+        ('USN005', 'Python', 4),
     ]
 
     # Sample availability (0=Sunday, 1=Monday, etc.)
@@ -914,83 +4016,11 @@ def insert_sample_data(matcher: WebScheduleMatcher):
     ]
 
     try:
-        if matcher.db_config['type'] == 'sqlalchemy':
-            with matcher.db_connection.connect() as conn:
-                # Insert skills first
-                for skill_id, skill_name in sample_skills:
-                    conn.execute(text("""
-                        INSERT INTO skills (skill_id, name)
-                        VALUES (:skill_id, :name)
-                        ON CONFLICT (skill_id) DO NOTHING
-                    """), {'skill_id': skill_id, 'name': skill_name})
-
-                # Insert users
-                for usn, first_name, last_name, dept, year in sample_users:
-                    conn.execute(text("""
-                        INSERT INTO sample_users (usn, first_name, last_name, department, year)
-                        VALUES (:usn, :first_name, :last_name, :department, :year)
-                        ON CONFLICT (usn) DO NOTHING
-                    """), {
-                        'usn': usn, 'first_name': first_name, 'last_name': last_name,
-                        'department': dept, 'year': year
-                    })
-
-                # Insert user skills
-                for usn, skill_id, level in sample_user_skills:
-                    conn.execute(text("""
-                        INSERT INTO sample_user_skills (usn, skill_id, proficiency_level)
-                        VALUES (:usn, :skill_id, :proficiency_level)
-                        ON CONFLICT (usn, skill_id) DO NOTHING
-                    """), {'usn': usn, 'skill_id': skill_id, 'proficiency_level': level})
-
-                # Insert availability
-                for usn, day, start_time, end_time, available in sample_availability:
-                    conn.execute(text("""
-                        INSERT INTO sample_user_availability
-                        (usn, day_of_week, time_slot_start, time_slot_end, is_available)
-                        VALUES (:usn, :day_of_week, :time_slot_start, :time_slot_end, :is_available)
-                        ON CONFLICT (usn, day_of_week, time_slot_start, time_slot_end) DO NOTHING
-                    """), {
-                        'usn': usn, 'day_of_week': day,
-                        'time_slot_start': start_time, 'time_slot_end': end_time,
-                        'is_available': available
-                    })
-
-                conn.commit()
-                print("Sample data inserted successfully!")
-
-        elif matcher.db_config['type'] == 'supabase':
-            # Insert using Supabase client
-            # Skills
-            matcher.db_connection.table('skills').upsert([
-                {'skill_id': sid, 'name': name} for sid, name in sample_skills
-            ]).execute()
-
-            # Users
-            matcher.db_connection.table('sample_users').upsert([
-                {
-                    'usn': usn, 'first_name': fname, 'last_name': lname,
-                    'department': dept, 'year': year
-                }
-                for usn, fname, lname, dept, year in sample_users
-            ]).execute()
-
-            # User skills
-            matcher.db_connection.table('sample_user_skills').upsert([
-                {'usn': usn, 'skill_id': sid, 'proficiency_level': level}
-                for usn, sid, level in sample_user_skills
-            ]).execute()
-
-            # Availability
-            matcher.db_connection.table('sample_user_availability').upsert([
-                {
-                    'usn': usn, 'day_of_week': day,
-                    'time_slot_start': start_time, 'time_slot_end': end_time,
-                    'is_available': available
-                }
-                for usn, day, start_time, end_time, available in sample_availability
-            ]).execute()
-
+        if bulk_insert_cohort(matcher, {
+            'users': sample_users,
+            'user_skills': sample_user_skills,
+            'availability': sample_availability
+        }):
             print("Sample data inserted successfully!")
 
     except Exception as e:
@@ -1000,16 +4030,27 @@ def insert_sample_data(matcher: WebScheduleMatcher):
 # FLASK/FASTAPI INTEGRATION EXAMPLES
 # ===========================================
 
-def create_flask_routes(matcher: WebScheduleMatcher):
+def create_flask_routes(matcher: WebScheduleMatcher, recommendation_index: bool = False):
     """
     Example Flask routes for the schedule matcher
     Install: pip install flask
+
+    With recommendation_index, the change listener is started and, once it
+    is LISTENing with the triggers in place (postgresql/sqlalchemy), the
+    whole cohort is loaded into the top-k recommendation index, which the
+    listener then keeps current.
     """
     try:
         from flask import Flask, request, jsonify
 
         app = Flask(__name__)
 
+        if recommendation_index:
+            if matcher.start_change_listener() and matcher.wait_for_change_listener():
+                matcher.build_recommendation_index()
+            else:
+                print("Change listener not ready, serving recommendations without the index")
+
         @app.route('/api/recommendations/<user_id>', methods=['GET'])
         def get_recommendations(user_id):
             """Get profile recommendations for a user"""
@@ -1048,23 +4089,67 @@ def create_flask_routes(matcher: WebScheduleMatcher):
             )
             return jsonify(result)
 
+        @app.route('/api/metrics/pool', methods=['GET'])
+        def get_pool_metrics():
+            """Database connection pool usage"""
+            return jsonify(matcher.get_pool_stats())
+
         return app
 
     except ImportError:
         print("Flask not installed. Install with: pip install flask")
         return None
 
-def create_fastapi_routes(matcher: WebScheduleMatcher):
+def create_fastapi_routes(matcher: WebScheduleMatcher, recommendation_index: bool = False):
     """
     Example FastAPI routes for the schedule matcher
     Install: pip install fastapi uvicorn
+
+    Pass an AsyncWebScheduleMatcher to keep database I/O on the event loop
+    (its pool is opened on startup and closed on shutdown); a sync
+    WebScheduleMatcher is called in the threadpool so it cannot block it.
+    With recommendation_index, startup also starts the change listener and,
+    once it is LISTENing with the triggers in place, builds the top-k
+    recommendation index, which the listener then keeps current.
     """
     try:
         from fastapi import FastAPI
+        from fastapi.concurrency import run_in_threadpool
         from pydantic import BaseModel
         from typing import List, Optional
 
-        app = FastAPI(title="Schedule Matcher API", version="1.0.0")
+        is_async = isinstance(matcher, AsyncWebScheduleMatcher)
+
+        @asynccontextmanager
+        async def lifespan(app):
+            if is_async and matcher.db_connection is None:
+                await matcher.connect_to_database()
+
+            if recommendation_index:
+                if is_async:
+                    ready = await matcher.start_change_listener() and await matcher.wait_for_change_listener()
+                    if ready:
+                        await matcher.build_recommendation_index()
+                else:
+                    ready = (await run_in_threadpool(matcher.start_change_listener)
+                             and await run_in_threadpool(matcher.wait_for_change_listener))
+                    if ready:
+                        await run_in_threadpool(matcher.build_recommendation_index)
+                if not ready:
+                    print("Change listener not ready, serving recommendations without the index")
+
+            yield
+            if is_async:
+                await matcher.close()
+            elif recommendation_index:
+                matcher.stop_change_listener()
+
+        async def call_matcher(method, *args):
+            if is_async:
+                return await method(*args)
+            return await run_in_threadpool(method, *args)
+
+        app = FastAPI(title="Schedule Matcher API", version="1.0.0", lifespan=lifespan)
 
         class RecommendationRequest(BaseModel):
             candidate_ids: List[str]
@@ -1092,7 +4177,7 @@ def create_fastapi_routes(matcher: WebScheduleMatcher):
                 'limit': request.limit
             }
 
-            return matcher.api_get_profile_recommendations(user_id, params)
+            return await call_matcher(matcher.api_get_profile_recommendations, user_id, params)
 
         @app.post("/api/team-meetings")
         async def get_team_meetings(request: TeamMeetingRequest):
@@ -1103,17 +4188,23 @@ def create_fastapi_routes(matcher: WebScheduleMatcher):
                 'min_duration_hours': request.min_duration_hours
             }
 
-            return matcher.api_get_team_meeting_slots(params)
+            return await call_matcher(matcher.api_get_team_meeting_slots, params)
 
         @app.post("/api/match-percentage")
         async def get_match_percentage(request: MatchPercentageRequest):
             """Get match percentage between two users"""
-            result = matcher.calculate_schedule_match_percentage(
+            result = await call_matcher(
+                matcher.calculate_schedule_match_percentage,
                 request.user1_id, request.user2_id,
                 request.preferred_days or matcher.days
             )
             return result
 
+        @app.get("/api/metrics/pool")
+        async def get_pool_metrics():
+            """Database connection pool usage"""
+            return matcher.get_pool_stats()
+
         return app
 
     except ImportError:
@@ -0,0 +1,52 @@
+import random
+
+import pytest
+
+from scheduling import WebScheduleMatcher
+
+
+def make_profiles(count, seed=0):
+    """DB-free profiles with random availability and one skill each"""
+    rng = random.Random(seed)
+    return {
+        f'USN{idx:03d}': {
+            'name': f'Student {idx}',
+            'skills': [{'skill_name': 'Python', 'proficiency_level': rng.randint(0, 5)}],
+            'schedule': {'available': rng.getrandbits(84), 'avoid': 0, 'valid': 0}
+        }
+        for idx in range(count)
+    }
+
+
+@pytest.mark.parametrize('student_count, team_size, expected_sizes', [
+    (3, 2, [3]),
+    (5, 2, [2, 3]),
+    (7, 3, [3, 4]),
+    (7, 4, [3, 4]),
+    (9, 4, [4, 5]),
+    (3, 4, [3]),
+    (14, 10, [4, 10]),
+])
+def test_form_teams_sizes(student_count, team_size, expected_sizes):
+    users_data = make_profiles(student_count)
+    result = WebScheduleMatcher().form_teams(team_size=team_size, time_budget_seconds=0.1,
+                                             users_data=users_data)
+
+    sizes = sorted(len(team['members']) for team in result['teams'])
+    assert sizes == expected_sizes
+    assert sorted(uid for team in result['teams'] for uid in team['members']) == sorted(users_data)
+
+
+@pytest.mark.parametrize('team_size', [2, 3, 4, 5])
+def test_form_teams_never_makes_single_member_teams(team_size):
+    for student_count in range(2, 30):
+        result = WebScheduleMatcher().form_teams(team_size=team_size, time_budget_seconds=0.1,
+                                                 users_data=make_profiles(student_count))
+        assert all(2 <= len(team['members']) <= team_size + 1 for team in result['teams'])
+
+
+def test_local_search_stops_at_a_local_optimum():
+    result = WebScheduleMatcher().form_teams(team_size=2, time_budget_seconds=5.0, users_data=make_profiles(4))
+
+    assert result['statistics']['elapsed_seconds'] < 1.0
+    assert result['statistics']['swaps_tried'] < 100